@@ -1,7 +1,6 @@
 import click
 import logging
 import os
-import uvicorn
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager, AsyncExitStack
 from dataclasses import dataclass
@@ -13,65 +12,79 @@ from starlette.routing import Mount
 from mcp.server.fastmcp import Context, FastMCP
 
 from nextcloud_mcp_server.config import setup_logging
-from nextcloud_mcp_server.client import NextcloudClient
+from nextcloud_mcp_server.client import NextcloudClient, close_shared_transport
 from nextcloud_mcp_server.utils import get_nc_client
-from nextcloud_mcp_server.server import (
-    configure_calendar_tools,
-    configure_contacts_tools,
-    configure_notes_tools,
-    configure_tables_tools,
-    configure_webdav_tools,
-    configure_deck_tools,
-)
+from nextcloud_mcp_server import server
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AppContext:
     client: Optional[NextcloudClient]  # None in multi-user mode
     nextcloud_host: str
     multi_user_mode: bool
 
 
-@asynccontextmanager
-async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
-    """Manage application lifecycle with type-safe context"""
-    # Check if multi-user mode is enabled
-    multi_user_mode = os.environ.get("NCMCP_MULTI_USER", "false").lower() == "true"
-    nextcloud_host = os.environ.get("NEXTCLOUD_HOST", "")
-    
-    if not nextcloud_host:
-        raise ValueError("NEXTCLOUD_HOST environment variable is required")
-    
-    if multi_user_mode:
-        # Multi-user mode: no global client, credentials come per-request
-        logging.info("Starting in multi-user mode - credentials required per request")
-        client = None
-    else:
-        # Single-user mode: create global client from env
-        logging.info("Starting in single-user mode")
-        client = NextcloudClient.from_env()
-        logging.info("Client initialization wait complete.")
-    
-    try:
-        yield AppContext(
-            client=client,
-            nextcloud_host=nextcloud_host,
-            multi_user_mode=multi_user_mode
-        )
-    finally:
-        # Cleanup on shutdown
-        if client:
-            await client.close()
+def _resolve_config(multi_user: bool | None = None) -> dict:
+    """Resolve server settings once, the CLI flag takes precedence over the
+    NCMCP_MULTI_USER environment variable."""
+    if multi_user is None:
+        multi_user = os.environ.get("NCMCP_MULTI_USER", "false").lower() == "true"
+    return {
+        "multi_user": multi_user,
+        "host": os.environ.get("NEXTCLOUD_HOST", ""),
+    }
 
 
-def get_app(transport: str = "sse", enabled_apps: list[str] | None = None, multi_user: bool | None = None):
+def _create_lifespan(config: dict):
+    @asynccontextmanager
+    async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
+        """Manage application lifecycle with type-safe context"""
+        multi_user_mode = config["multi_user"]
+        nextcloud_host = config["host"]
+
+        if not nextcloud_host:
+            raise ValueError("NEXTCLOUD_HOST environment variable is required")
+
+        if multi_user_mode:
+            # Multi-user mode: no global client, credentials come per-request
+            logging.info(
+                "Starting in multi-user mode - credentials required per request"
+            )
+            client = None
+        else:
+            # Single-user mode: create global client from env
+            logging.info("Starting in single-user mode")
+            client = NextcloudClient.from_env()
+            logging.info("Client initialization wait complete.")
+
+        try:
+            yield AppContext(
+                client=client,
+                nextcloud_host=nextcloud_host,
+                multi_user_mode=multi_user_mode,
+            )
+        finally:
+            # Runs at the end of every MCP session; the shared connection pool
+            # is still in use by other sessions and is closed with the app
+            if client:
+                await client.close()
+
+    return app_lifespan
+
+
+def get_app(
+    transport: str = "sse",
+    enabled_apps: list[str] | None = None,
+    multi_user: bool | None = None,
+):
     setup_logging()
+    config = _resolve_config(multi_user)
 
     # Create an MCP server
-    mcp = FastMCP("Nextcloud MCP", lifespan=app_lifespan)
+    mcp = FastMCP("Nextcloud MCP", lifespan=_create_lifespan(config))
 
     @mcp.resource("nc://capabilities")
     async def nc_get_capabilities():
@@ -82,14 +95,15 @@ def get_app(transport: str = "sse", enabled_apps: list[str] | None = None, multi
         client: NextcloudClient = get_nc_client(ctx)
         return await client.capabilities()
 
-    # Define available apps and their configuration functions
+    # Define available apps and their configuration functions, the tool
+    # modules are only imported for the apps that get enabled
     available_apps = {
-        "notes": configure_notes_tools,
-        "tables": configure_tables_tools,
-        "webdav": configure_webdav_tools,
-        "calendar": configure_calendar_tools,
-        "contacts": configure_contacts_tools,
-        "deck": configure_deck_tools,
+        "notes": "configure_notes_tools",
+        "tables": "configure_tables_tools",
+        "webdav": "configure_webdav_tools",
+        "calendar": "configure_calendar_tools",
+        "contacts": "configure_contacts_tools",
+        "deck": "configure_deck_tools",
     }
 
     # If no specific apps are specified, enable all
@@ -100,7 +114,7 @@ def get_app(transport: str = "sse", enabled_apps: list[str] | None = None, multi
     for app_name in enabled_apps:
         if app_name in available_apps:
             logger.info(f"Configuring {app_name} tools")
-            available_apps[app_name](mcp)
+            getattr(server, available_apps[app_name])(mcp)
         else:
             logger.warning(
                 f"Unknown app: {app_name}. Available apps: {list(available_apps.keys())}"
@@ -108,7 +122,14 @@ def get_app(transport: str = "sse", enabled_apps: list[str] | None = None, multi
 
     if transport == "sse":
         mcp_app = mcp.sse_app()
-        lifespan = None
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette):
+            try:
+                yield
+            finally:
+                await close_shared_transport()
+
         app = Starlette(routes=[Mount("/", app=mcp_app)], lifespan=lifespan)
     elif transport in ("http", "streamable-http"):
         mcp_app = mcp.streamable_http_app()
@@ -116,24 +137,21 @@ def get_app(transport: str = "sse", enabled_apps: list[str] | None = None, multi
         @asynccontextmanager
         async def lifespan(app: Starlette):
             async with AsyncExitStack() as stack:
+                stack.push_async_callback(close_shared_transport)
                 await stack.enter_async_context(mcp.session_manager.run())
                 yield
 
         app = Starlette(routes=[Mount("/", app=mcp_app)], lifespan=lifespan)
-        
+
         # Add multi-user middleware if enabled
-        # CLI flag takes precedence over environment variable
-        if multi_user is not None:
-            multi_user_mode = multi_user
-        else:
-            multi_user_mode = os.environ.get("NCMCP_MULTI_USER", "false").lower() == "true"
-        
-        if multi_user_mode:
+        if config["multi_user"]:
             from nextcloud_mcp_server.middleware import MultiUserAuthMiddleware
-            nextcloud_host = os.environ.get("NEXTCLOUD_HOST", "")
-            if not nextcloud_host:
-                raise ValueError("NEXTCLOUD_HOST environment variable is required for multi-user mode")
-            app.add_middleware(MultiUserAuthMiddleware, nextcloud_host=nextcloud_host)
+
+            if not config["host"]:
+                raise ValueError(
+                    "NEXTCLOUD_HOST environment variable is required for multi-user mode"
+                )
+            app.add_middleware(MultiUserAuthMiddleware, nextcloud_host=config["host"])
 
     return app
 
@@ -150,6 +168,13 @@ def get_app(transport: str = "sse", enabled_apps: list[str] | None = None, multi
     show_default=True,
     type=click.Choice(["critical", "error", "warning", "info", "debug", "trace"]),
 )
+@click.option(
+    "--loop",
+    default="auto",
+    show_default=True,
+    type=click.Choice(["auto", "asyncio", "uvloop"]),
+    help="Event loop implementation. 'auto' uses uvloop when it is installed.",
+)
 @click.option(
     "--transport",
     "-t",
@@ -175,12 +200,15 @@ def run(
     workers: int,
     reload: bool,
     log_level: str,
+    loop: str,
     transport: str,
     enable_app: tuple[str, ...],
     multi_user: bool,
 ):
+    import uvicorn
+
     enabled_apps = list(enable_app) if enable_app else None
-    
+
     # Set environment variable if CLI flag is provided (takes precedence)
     if multi_user:
         os.environ["NCMCP_MULTI_USER"] = "true"
@@ -189,7 +217,12 @@ def run(
         app = "nextcloud_mcp_server.app:get_app"
         factory = True
     else:
-        app = get_app(transport=transport, enabled_apps=enabled_apps, multi_user=multi_user)
+        # Without the flag, fall back to NCMCP_MULTI_USER
+        app = get_app(
+            transport=transport,
+            enabled_apps=enabled_apps,
+            multi_user=True if multi_user else None,
+        )
         factory = False
 
     uvicorn.run(
@@ -200,6 +233,7 @@ def run(
         reload=reload,
         workers=workers,
         log_level=log_level,
+        loop=loop,
     )
 
 
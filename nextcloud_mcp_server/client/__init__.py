@@ -1,17 +1,26 @@
+import asyncio
+import importlib.util
 import logging
 import os
+import time
+from operator import attrgetter
+from typing import Any, Sequence
 
 from httpx import (
     AsyncClient,
     Auth,
     BasicAuth,
+    Limits,
+    codes,
     Request,
     Response,
     AsyncBaseTransport,
     AsyncHTTPTransport,
+    ByteStream,
 )
 
 from ..controllers.notes_search import NotesSearchController
+from .base import HTTP_TIMEOUTS, OCS_JSON_HEADERS, decode_json
 from .calendar import CalendarClient
 from .contacts import ContactsClient
 from .deck import DeckClient
@@ -21,38 +30,143 @@ from .webdav import WebDAVClient
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 requires the optional `h2` package, fall back to HTTP/1.1 without it
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer setting, falling back to `default` if invalid."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        logger.warning(
+            "Invalid value %r for %s, using the default %d", value, name, default
+        )
+        return default
+    return number
+
+
+# Connection pool shared by every NextcloudClient in the process, so that
+# per-user clients (multi-user mode) reuse warm TCP/TLS connections. Failed
+# connection attempts are retried once, requests themselves are never resent
+_SHARED_TRANSPORT = AsyncHTTPTransport(
+    http2=HTTP2_ENABLED,
+    retries=1,
+    limits=Limits(
+        max_connections=_env_int("NCMCP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_env_int("NCMCP_MAX_KEEPALIVE", 50),
+        keepalive_expiry=30,
+    ),
+)
+
+# Requests of a single client that may be in flight at the same time
+MAX_CONCURRENCY = _env_int("NCMCP_CONCURRENCY", 64)
+
+# Request and response bodies are logged up to this many bytes
+LOG_BODY_LIMIT = 4096
+
+
+async def close_shared_transport():
+    """Close every connection of the shared pool, including those in use.
+
+    Requests in flight on any client fail, so call this only once the
+    process shuts down, never when a single session or client ends.
+    """
+    await _SHARED_TRANSPORT.aclose()
+
+
+def _is_text(content_type: str) -> bool:
+    """Whether a body of this content type is worth logging."""
+    mime_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        not mime_type
+        or mime_type.startswith("text/")
+        or mime_type.endswith(("json", "xml"))
+        or mime_type == "application/x-www-form-urlencoded"
+    )
+
 
 async def log_request(request: Request):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
     # Redact authorization headers for security
     safe_headers = dict(request.headers)
     if "authorization" in safe_headers:
         safe_headers["authorization"] = "[REDACTED]"
-    
+
     logger.debug(
         "Request event hook: %s %s - Waiting for content",
         request.method,
         request.url,
     )
-    logger.debug("Request body: %s", request.content)
+    # Streamed bodies are not available up front, binary ones are not worth
+    # logging and large ones are capped
+    if not _is_text(request.headers.get("content-type", "")):
+        logger.debug("Request body: <binary>")
+    elif isinstance(request.stream, ByteStream):
+        body = request.content
+        logger.debug("Request body (%d bytes): %r", len(body), body[:LOG_BODY_LIMIT])
+    else:
+        logger.debug("Request body: <streamed>")
     logger.debug("Headers: %s", safe_headers)
 
 
 async def log_response(response: Response):
+    # Only buffer the body when it will actually be logged, so that large or
+    # streamed responses are not read into memory just for debugging
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    # Bodies without a valid length (chunked, or a malformed header) may be
+    # of any size and are elided too
+    content_length = response.headers.get("content-length")
+    try:
+        length = int(content_length) if content_length is not None else None
+    except ValueError:
+        length = None
+    if (
+        length is None
+        or length > LOG_BODY_LIMIT
+        or not _is_text(response.headers.get("content-type", ""))
+    ):
+        logger.debug(
+            "Response [%s] (%s bytes, body elided)",
+            response.status_code,
+            length if length is not None else "unknown",
+        )
+        return
     await response.aread()
-    logger.debug("Response [%s] %s", response.status_code, response.text)
+    logger.debug(
+        "Response [%s] %s", response.status_code, response.text[:LOG_BODY_LIMIT]
+    )
 
 
 class AsyncDisableCookieTransport(AsyncBaseTransport):
     """This Transport disable cookies from accumulating in the httpx AsyncClient
 
     Thanks to: https://github.com/encode/httpx/issues/2992#issuecomment-2133258994
+
+    `aclose()` is intentionally not forwarded, the wrapped transport may be the
+    process-wide shared pool which must outlive individual clients.
+
+    At most `max_concurrency` requests of one client are sent at a time, so a
+    single busy client cannot take every connection of the shared pool.
     """
 
-    def __init__(self, transport: AsyncBaseTransport):
+    def __init__(
+        self, transport: AsyncBaseTransport, max_concurrency: int = MAX_CONCURRENCY
+    ):
         self.transport = transport
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
     async def handle_async_request(self, request: Request) -> Response:
-        response = await self.transport.handle_async_request(request)
+        async with self._semaphore:
+            response = await self.transport.handle_async_request(request)
         response.headers.pop("set-cookie", None)
         return response
 
@@ -60,12 +174,64 @@ class AsyncDisableCookieTransport(AsyncBaseTransport):
 class NextcloudClient:
     """Main Nextcloud client that orchestrates all app clients."""
 
+    # Seconds a cached capabilities response is served without revalidation
+    CAPABILITIES_TTL = 300
+
+    # Above this many changed notes, search re-lists all notes with content
+    # instead of fetching the changed notes one by one
+    SEARCH_MAX_NOTE_FETCHES = 20
+
+    # App client methods that `batch` may call
+    BATCH_METHODS = frozenset(
+        {
+            "notes.get_all_notes",
+            "notes.get_note",
+            "notes.create_note",
+            "notes.update",
+            "notes.delete_note",
+            "notes.append_content",
+            "webdav.list_directory",
+            "webdav.read_file",
+            "webdav.write_file",
+            "webdav.create_directory",
+            "webdav.delete_resource",
+            "webdav.move_resource",
+            "webdav.copy_resource",
+            "tables.list_tables",
+            "tables.get_table_schema",
+            "tables.get_table_rows",
+            "tables.create_row",
+            "tables.update_row",
+            "tables.delete_row",
+            "calendar.list_calendars",
+            "calendar.get_calendar_events",
+            "calendar.get_event",
+            "calendar.create_event",
+            "calendar.update_event",
+            "calendar.delete_event",
+            "contacts.list_addressbooks",
+            "contacts.list_contacts",
+            "contacts.create_contact",
+            "contacts.update_contact",
+            "contacts.delete_contact",
+            "deck.get_boards",
+            "deck.get_board",
+            "deck.get_stacks",
+            "deck.get_stack",
+            "deck.get_card",
+            "deck.create_card",
+            "deck.update_card",
+            "deck.delete_card",
+        }
+    )
+
     def __init__(self, base_url: str, username: str, auth: Auth | None = None):
         self.username = username
         self._client = AsyncClient(
             base_url=base_url,
             auth=auth,
-            transport=AsyncDisableCookieTransport(AsyncHTTPTransport()),
+            transport=AsyncDisableCookieTransport(_SHARED_TRANSPORT),
+            timeout=HTTP_TIMEOUTS["default"],
             event_hooks={"request": [log_request], "response": [log_response]},
         )
 
@@ -79,6 +245,11 @@ class NextcloudClient:
 
         # Initialize controllers
         self._notes_search = NotesSearchController()
+        self._notes_search_lock = asyncio.Lock()
+
+        # Capabilities cache: (fetched_at, etag, parsed response)
+        self._capabilities_cache: tuple[float, str, dict] | None = None
+        self._capabilities_lock = asyncio.Lock()
 
     @classmethod
     def from_env(cls):
@@ -91,22 +262,132 @@ class NextcloudClient:
         return cls(base_url=host, username=username, auth=BasicAuth(username, password))
 
     async def capabilities(self):
-        response = await self._client.get(
-            "/ocs/v2.php/cloud/capabilities",
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
-        )
-        response.raise_for_status()
+        """Get the server capabilities.
+
+        The response is cached per client. Within `CAPABILITIES_TTL` seconds the
+        cached value is returned directly, afterwards it is revalidated with
+        `If-None-Match` so an unchanged response costs only a `304`.
+        """
+        async with self._capabilities_lock:
+            cached = self._capabilities_cache
+            if cached and time.monotonic() - cached[0] < self.CAPABILITIES_TTL:
+                return cached[2]
+
+            headers = dict(OCS_JSON_HEADERS)
+            if cached and cached[1]:
+                headers["If-None-Match"] = cached[1]
+
+            response = await self._client.get(
+                "/ocs/v2.php/cloud/capabilities", headers=headers
+            )
+            if cached and response.status_code == codes.NOT_MODIFIED:
+                self._capabilities_cache = (time.monotonic(), cached[1], cached[2])
+                return cached[2]
+            response.raise_for_status()
+
+            data = decode_json(response)
+            self._capabilities_cache = (
+                time.monotonic(),
+                response.headers.get("etag", ""),
+                data,
+            )
+            return data
+
+    async def notes_search_notes(self, *, query: str, limit: int | None = None):
+        """Search notes using token-based matching with relevance ranking.
+
+        Notes are listed without their content first; only notes that changed
+        since they were last indexed are fetched in full. When many notes
+        changed, a single full listing is cheaper than fetching each one.
+
+        Tokenizing and scoring run in a worker thread so large notes do not
+        block the event loop; searches of one client are serialized since
+        they share the search index.
+        """
+        all_notes = await self.notes.get_all_notes(exclude="content")
+        uncached_ids = self._notes_search.uncached_note_ids(all_notes)
+        if len(uncached_ids) > self.SEARCH_MAX_NOTE_FETCHES:
+            all_notes = await self.notes.get_all_notes()
+        elif uncached_ids:
+            fetched = await self.notes.get_notes(uncached_ids)
+            fetched_by_id = {note["id"]: note for note in fetched}
+            all_notes = [fetched_by_id.get(note["id"], note) for note in all_notes]
+        async with self._notes_search_lock:
+            return await asyncio.to_thread(
+                self._notes_search.search_notes, all_notes, query, limit
+            )
+
+    async def batch(self, calls: Sequence[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Run several client calls, overlapping those that are independent.
+
+        Each call is a `(method, kwargs)` pair such as
+        `("notes.get_note", {"note_id": 1})`, where the method is one of
+        `BATCH_METHODS`. A keyword argument may be `{"$ref": i}` to pass the
+        result of call `i`, or `{"$ref": i, "field": name}` to pass one field
+        of it. Calls whose references are resolved run concurrently, layer by
+        layer, and the results are returned in the order of `calls`.
+
+        Invalid calls raise ValueError before any call is made.
+        """
+        deps: list[set[int]] = []
+        for index, (method, kwargs) in enumerate(calls):
+            if method not in self.BATCH_METHODS:
+                raise ValueError(f"Call {index} has an unsupported method: {method!r}")
+            refs = set()
+            for value in kwargs.values():
+                if not (isinstance(value, dict) and "$ref" in value):
+                    continue
+                ref = value["$ref"]
+                if (
+                    isinstance(ref, bool)
+                    or not isinstance(ref, int)
+                    or not 0 <= ref < len(calls)
+                    or ref == index
+                    or not isinstance(value.get("field", ""), str)
+                    or value.keys() - {"$ref", "field"}
+                ):
+                    raise ValueError(f"Call {index} has an invalid $ref: {value!r}")
+                refs.add(ref)
+            deps.append(refs)
 
-        return response.json()
+        def resolve(value: Any, results: dict[int, Any]) -> Any:
+            if not (isinstance(value, dict) and "$ref" in value):
+                return value
+            result = results[value["$ref"]]
+            if "field" not in value:
+                return result
+            if not isinstance(result, dict) or value["field"] not in result:
+                raise ValueError(
+                    f"Result of call {value['$ref']} has no field {value['field']!r}"
+                )
+            return result[value["field"]]
 
-    async def notes_search_notes(self, *, query: str):
-        """Search notes using token-based matching with relevance ranking."""
-        all_notes = await self.notes.get_all_notes()
-        return self._notes_search.search_notes(all_notes, query)
+        results: dict[int, Any] = {}
+        pending = set(range(len(calls)))
+        while pending:
+            layer = sorted(index for index in pending if deps[index] <= results.keys())
+            if not layer:
+                raise ValueError(f"Calls {sorted(pending)} have circular $refs")
+            layer_kwargs = [
+                {
+                    name: resolve(value, results)
+                    for name, value in calls[index][1].items()
+                }
+                for index in layer
+            ]
+            layer_results = await asyncio.gather(
+                *(
+                    attrgetter(calls[index][0])(self)(**kwargs)
+                    for index, kwargs in zip(layer, layer_kwargs)
+                )
+            )
+            results.update(zip(layer, layer_results))
+            pending.difference_update(layer)
+        return [results[index] for index in range(len(calls))]
 
     def _get_webdav_base_path(self) -> str:
         """Helper to get the base WebDAV path for the authenticated user."""
-        return f"/remote.php/dav/files/{self.username}"
+        return self.webdav._webdav_base
 
     async def close(self):
         """Close the HTTP client."""
@@ -1,70 +1,234 @@
 """Base client for Nextcloud operations with shared authentication."""
 
+import asyncio
+import json
 import logging
+import random
+import xml.etree.ElementTree as ET
 from abc import ABC
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Iterable, List
 
 from functools import wraps
-import time
-from httpx import HTTPStatusError, codes, RequestError, AsyncClient
+from httpx import (
+    HTTPStatusError,
+    codes,
+    RequestError,
+    AsyncClient,
+    Headers,
+    Response,
+    Timeout,
+)
+
+try:
+    # orjson is optional, it is considerably faster for large payloads
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # lxml is optional, it parses large XML responses considerably faster
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
 logger = logging.getLogger(__name__)
 
+# Timeouts for API calls ("default") and for file transfers ("transfer"),
+# where large bodies need much longer to be written or read
+HTTP_TIMEOUTS = {
+    "default": Timeout(30.0, connect=5.0, pool=5.0),
+    "transfer": Timeout(300.0, connect=5.0, pool=5.0),
+}
+
+# Bytes of a multistatus body handed to the XML parser at a time
+MULTISTATUS_CHUNK_SIZE = 64 * 1024
+
+# Headers for OCS endpoints returning JSON, httpx copies them per request
+OCS_JSON_HEADERS = {"OCS-APIRequest": "true", "Accept": "application/json"}
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize a request body to compact UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(response: Response) -> Any:
+    """Decode a JSON response body straight from its raw bytes."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+# Retries of rate limited (429) or unavailable (503) requests, with
+# exponential backoff in seconds unless the server sends Retry-After
+MAX_RETRIES = 5
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP = 30.0
+
+# Methods that can be sent again after a 503 without repeating side effects,
+# a 429 is retried for any method since the request was not processed
+_IDEMPOTENT_METHODS = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "MKCOL", "PROPFIND", "REPORT"}
+)
+
+
+def _retry_delay(response: Response, attempt: int) -> float:
+    """Seconds to wait before retrying, honoring Retry-After if present."""
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (
+                    parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)
+                ).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(RETRY_BACKOFF_CAP, max(0.0, delay))
+    backoff = RETRY_BACKOFF_BASE * 2 ** (attempt - 1)
+    return min(RETRY_BACKOFF_CAP, backoff + random.uniform(0, RETRY_BACKOFF_BASE))
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable[Any]], limit: int, return_exceptions: bool = False
+) -> List[Any]:
+    """Like `asyncio.gather`, but with at most `limit` awaitables running."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return list(
+        await asyncio.gather(
+            *(run(aw) for aw in aws), return_exceptions=return_exceptions
+        )
+    )
+
+
+async def iter_multistatus(response: Response) -> AsyncIterator[ET.Element]:
+    """Yield the `<d:response>` elements of a streamed WebDAV multistatus body.
+
+    The body is parsed incrementally as it arrives and each element is
+    cleared and detached from the `<d:multistatus>` root once the consumer
+    moves on, so memory stays bounded by a single response element rather
+    than the whole document. The response is closed when the iteration
+    ends, consumers that stop early should use `contextlib.aclosing` so
+    this happens right away.
+    """
+    # Start events only serve to find the root element
+    if lxml_etree is not None:
+        # Entities are not resolved, like with the stdlib parser
+        parser = lxml_etree.XMLPullParser(
+            events=("start", "end"), resolve_entities=False, no_network=True
+        )
+    else:
+        parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+
+    def parsed_responses():
+        nonlocal root
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+            elif elem.tag == "{DAV:}response":
+                yield elem
+
+    def release(elem):
+        elem.clear()
+        # Drop the response, and any other elements before it, from the root
+        for index, child in enumerate(root if root is not None else ()):
+            if child is elem:
+                del root[: index + 1]
+                break
+
+    try:
+        # Fed in slices, so that stopping early skips parsing the rest
+        async for chunk in response.aiter_bytes(MULTISTATUS_CHUNK_SIZE):
+            parser.feed(chunk)
+            for elem in parsed_responses():
+                yield elem
+                release(elem)
+        parser.close()
+        for elem in parsed_responses():
+            yield elem
+            release(elem)
+    finally:
+        await response.aclose()
+
 
 def retry_on_429(func):
     """This decorator handles the 429 response from REST APIs
 
     The `func` is assumed to be a method that is similar to `httpx.Client.get`,
-    and returns an `httpx.Response` object. In the case of `Too Many Requests` HTTP
-    response, the function will wait for a couple of seconds and retry the request.
+    and returns an `httpx.Response` object. In the case of `Too Many Requests`
+    (or `Service Unavailable` for idempotent methods) the request is retried
+    after the delay given by `Retry-After`, or with exponential backoff. The
+    wait does not block the event loop.
     """
 
-    MAX_RETRIES = 5
-
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        retries = 0
+        method = str(args[1] if len(args) > 1 else kwargs.get("method", "")).upper()
 
-        while retries < MAX_RETRIES:
+        for retries in range(1, MAX_RETRIES + 1):
             try:
-                # Make GET API call
-                retries += 1
-                response = await func(*args, **kwargs)
-                break
+                return await func(*args, **kwargs)
 
             except HTTPStatusError as e:
-                # If we get a '429 Client Error: Too Many Requests'
-                # error we wait a couple of seconds and do a retry
-                if e.response.status_code == codes.TOO_MANY_REQUESTS:
+                status_code = e.response.status_code
+                if status_code == codes.TOO_MANY_REQUESTS or (
+                    status_code == codes.SERVICE_UNAVAILABLE
+                    and method in _IDEMPOTENT_METHODS
+                ):
+                    if retries == MAX_RETRIES:
+                        break
+                    delay = _retry_delay(e.response, retries)
                     logger.warning(
-                        f"429 Client Error: Too Many Requests, Number of attempts: {retries}"
+                        "HTTPStatusError %s, retrying in %.1fs, Number of attempts: %s",
+                        status_code,
+                        delay,
+                        retries,
                     )
-                    time.sleep(5)
-                elif e.response.status_code == 404:
+                    await asyncio.sleep(delay)
+                elif status_code == 404:
                     # 404 errors are often expected (e.g., checking if attachments exist)
                     # Log as debug instead of warning
                     logger.debug(
-                        f"HTTPStatusError {e.response.status_code}: {e}, Number of attempts: {retries}"
+                        "HTTPStatusError %s: %s, Number of attempts: %s",
+                        status_code,
+                        e,
+                        retries,
                     )
                     raise
                 else:
                     logger.warning(
-                        f"HTTPStatusError {e.response.status_code}: {e}, Number of attempts: {retries}"
+                        "HTTPStatusError %s: %s, Number of attempts: %s",
+                        status_code,
+                        e,
+                        retries,
                     )
                     raise
             except RequestError as e:
                 logger.warning(
-                    f"RequestError {e.request.url}: {e}, Number of attempts: {retries}"
+                    "RequestError %s: %s, Number of attempts: %s",
+                    e.request.url,
+                    e,
+                    retries,
                 )
                 raise
 
-        # If for loop ends without break statement
-        else:
-            logger.warning("All API call retries failed")
-            raise RuntimeError(
-                f"Maximum number of retries ({MAX_RETRIES}) exceeded without success"
-            )
-
-        return response
+        logger.warning("All API call retries failed")
+        raise RuntimeError(
+            f"Maximum number of retries ({MAX_RETRIES}) exceeded without success"
+        )
 
     return wrapper
 
@@ -81,10 +245,11 @@ class BaseNextcloudClient(ABC):
         """
         self._client = http_client
         self.username = username
+        self._webdav_base = f"/remote.php/dav/files/{username}"
 
     def _get_webdav_base_path(self) -> str:
         """Helper to get the base WebDAV path for the authenticated user."""
-        return f"/remote.php/dav/files/{self.username}"
+        return self._webdav_base
 
     @retry_on_429
     async def _make_request(self, method: str, url: str, **kwargs):
@@ -93,12 +258,32 @@ class BaseNextcloudClient(ABC):
         Args:
             method: HTTP method
             url: Request URL
-            **kwargs: Additional request parameters
+            **kwargs: Additional request parameters, `stream=True` returns
+                the response before its body is read, the caller must
+                close it. `allow_status` lists error status codes that are
+                returned instead of raised
 
         Returns:
             Response object
         """
-        logger.debug(f"Making {method} request to {url}")
-        response = await self._client.request(method, url, **kwargs)
-        response.raise_for_status()
+        logger.debug("Making %s request to %s", method, url)
+        allow_status = kwargs.pop("allow_status", ())
+        if "json" in kwargs:
+            headers = Headers(kwargs.get("headers"))
+            headers.setdefault("Content-Type", "application/json")
+            kwargs["headers"] = headers
+            kwargs["content"] = json_dumps(kwargs.pop("json"))
+        if kwargs.pop("stream", False):
+            request = self._client.build_request(method, url, **kwargs)
+            response = await self._client.send(request, stream=True)
+            if response.is_error and response.status_code not in allow_status:
+                await response.aclose()
+        else:
+            response = await self._client.request(method, url, **kwargs)
+        # 304 only answers conditional requests, which callers handle themselves
+        if (
+            response.status_code != codes.NOT_MODIFIED
+            and response.status_code not in allow_status
+        ):
+            response.raise_for_status()
         return response
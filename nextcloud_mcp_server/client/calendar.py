@@ -2,23 +2,221 @@
 
 import datetime as dt
 import logging
+import re
+import time
 import uuid
-import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape as xml_escape
+from zoneinfo import ZoneInfo
 
-from httpx import HTTPStatusError
-from icalendar import Alarm, Calendar
-from icalendar import Event as ICalEvent
-from icalendar import vRecur
+from httpx import AsyncClient, HTTPStatusError
+from icalendar import Calendar, vDuration, vRecur
+from icalendar.parser import unescape_char
 
-from .base import BaseNextcloudClient
+from .base import BaseNextcloudClient, gather_bounded, iter_multistatus
 
 logger = logging.getLogger(__name__)
 
+# Event filters matched by the server, and the iCalendar property they match
+_SERVER_TEXT_FILTERS = (
+    ("title_contains", "SUMMARY"),
+    ("location_contains", "LOCATION"),
+)
+
+# Event filters and the types of their values; text filters also accept
+# numbers, which are matched as text. start_date and end_date are ISO dates
+# picking the search range of `bulk_update_events`
+_TEXT_FILTER_TYPES = (str, int, float)
+_EVENT_FILTER_TYPES = {
+    "title_contains": _TEXT_FILTER_TYPES,
+    "location_contains": _TEXT_FILTER_TYPES,
+    "status": _TEXT_FILTER_TYPES,
+    "categories": list,
+    "min_attendees": int,
+    "min_duration_minutes": (int, float),
+    "start_date": str,
+    "end_date": str,
+}
+
+
+def _validate_event_filters(filters: Dict[str, Any]) -> None:
+    """Raise ValueError for unknown event filters or invalid filter values."""
+    for key, value in filters.items():
+        expected = _EVENT_FILTER_TYPES.get(key)
+        if expected is None:
+            raise ValueError(
+                f"Unknown event filter '{key}', expected one of "
+                f"{', '.join(_EVENT_FILTER_TYPES)}"
+            )
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError(f"Invalid value for event filter '{key}': {value!r}")
+        if key == "categories" and not all(
+            isinstance(cat, _TEXT_FILTER_TYPES) for cat in value
+        ):
+            raise ValueError(f"Invalid value for event filter '{key}': {value!r}")
+        if key in ("start_date", "end_date"):
+            try:
+                dt.datetime.fromisoformat(value)
+            except ValueError as e:
+                raise ValueError(
+                    f"Invalid date for event filter '{key}': {value!r}"
+                ) from e
+
+
+# Slots returned by find_availability
+MAX_AVAILABLE_SLOTS = 10
+
+# Calendars whose events are fetched at the same time
+CALENDAR_FETCH_CONCURRENCY = 10
+
+# Element paths into multistatus responses, defined once so that they are
+# not rebuilt per element (ElementTree and lxml cache their compiled form).
+# Each element is a direct child of the previous one, so the paths use the
+# child axis instead of searching all descendants
+_HREF_PATH = "{DAV:}href"
+_PROPSTAT_PATH = "{DAV:}propstat"
+_PROP_PATH = "{DAV:}prop"
+_RESOURCETYPE_PATH = "{DAV:}resourcetype"
+_CALENDAR_PATH = "{urn:ietf:params:xml:ns:caldav}calendar"
+_DISPLAYNAME_PATH = "{DAV:}displayname"
+_DESCRIPTION_PATH = "{urn:ietf:params:xml:ns:caldav}calendar-description"
+_COLOR_PATH = "{http://calendarserver.org/ns/}calendar-color"
+_CALENDAR_DATA_PATH = "{urn:ietf:params:xml:ns:caldav}calendar-data"
+_GETETAG_PATH = "{DAV:}getetag"
+
+# Static request headers, httpx copies them per request
+_DAV_QUERY_HEADERS = {
+    "Depth": "1",
+    "Content-Type": "application/xml",
+    "Accept": "application/xml",
+}
+_ICAL_ACCEPT_HEADERS = {"Accept": "text/calendar"}
+_ICAL_CONTENT_TYPE = "text/calendar; charset=utf-8"
+_ICAL_CREATE_HEADERS = {
+    "Content-Type": _ICAL_CONTENT_TYPE,
+    "If-None-Match": "*",  # Ensure we're creating, not updating
+}
+_MKCALENDAR_HEADERS = {"Content-Type": "application/xml", "Depth": "0"}
+
+# Request bodies, only the event filters are filled in per request
+_CALENDARS_PROPFIND_BODY = b"""<?xml version="1.0" encoding="utf-8"?>
+<d:propfind xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav" xmlns:cs="http://calendarserver.org/ns/">
+    <d:prop>
+        <d:displayname/>
+        <d:resourcetype/>
+        <c:calendar-description/>
+        <cs:calendar-color/>
+        <c:supported-calendar-component-set/>
+    </d:prop>
+</d:propfind>"""
+_EVENTS_REPORT_BODY = """<?xml version="1.0" encoding="utf-8"?>
+<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+    <d:prop>
+        <d:getetag/>
+        <c:calendar-data/>
+    </d:prop>
+    <c:filter>
+        <c:comp-filter name="VCALENDAR">
+            <c:comp-filter name="VEVENT">{filters}
+            </c:comp-filter>
+        </c:comp-filter>
+    </c:filter>
+</c:calendar-query>"""
+_TIME_RANGE_FILTER = """
+                <c:time-range start="{start}" end="{end}"/>"""
+_TEXT_MATCH_FILTER = """
+                <c:prop-filter name="{name}">
+                    <c:text-match collation="i;unicode-casemap">{text}</c:text-match>
+                </c:prop-filter>"""
+
+# iCalendar line unfolding and content lines ("NAME;PARAM=a:value", where
+# quoted parameter values may contain colons), RFC 5545 3.1. Line breaks may
+# be LF only since XML parsers normalize CRLF
+_ICAL_FOLD_RE = re.compile(r"\r?\n[ \t]")
+_ICAL_LINE_BREAK_RE = re.compile(r"\r?\n")
+_ICAL_CONTENT_LINE_RE = re.compile(r'((?:[^":]|"[^"]*")*):(.*)', re.DOTALL)
+
+
+@lru_cache(maxsize=4096)
+def _event_datetime(value: str) -> dt.datetime:
+    """Parse an event's ISO start or end time.
+
+    The same events are filtered and checked for availability repeatedly,
+    and datetimes are immutable, so parsed values are cached and shared.
+    """
+    return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _ical_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ical_datetime(value: dt.datetime) -> str:
+    """Format a datetime as local time, or in UTC if it has a time zone."""
+    if value.tzinfo is None:
+        return value.strftime("%Y%m%dT%H%M%S")
+    return value.astimezone(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold_ical_line(line: str) -> str:
+    """Fold a content line into lines of at most 75 octets (RFC 5545 3.1)."""
+    encoded = line.encode()
+    parts = []
+    limit = 75
+    while len(encoded) > limit:
+        # Do not split a UTF-8 sequence, continuation bytes are 10xxxxxx
+        cut = limit
+        while encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+        limit = 74  # Continuation lines start with a space
+    parts.append(encoded.decode())
+    return "\r\n ".join(parts)
+
+
+def _ical_date_value(value: str, params: List[str]) -> dt.date:
+    """Parse a DTSTART/DTEND value like icalendar does, or raise ValueError."""
+    if "VALUE=DATE" in params or len(value) == 8:
+        return dt.datetime.strptime(value, "%Y%m%d").date()
+    if value.endswith("Z"):
+        return dt.datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(
+            tzinfo=dt.timezone.utc
+        )
+    parsed = dt.datetime.strptime(value, "%Y%m%dT%H%M%S")
+    for param in params:
+        if param.startswith("TZID="):
+            try:
+                return parsed.replace(tzinfo=ZoneInfo(param[5:].strip('"')))
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"Unknown time zone {param[5:]}") from e
+    return parsed
+
 
 class CalendarClient(BaseNextcloudClient):
     """Client for NextCloud CalDAV calendar operations."""
 
+    # Seconds a calendar listing is served from the cache
+    CALENDARS_TTL = 60.0
+
+    def __init__(self, http_client: AsyncClient, username: str):
+        super().__init__(http_client, username)
+        # (fetched_at, calendars) of the last calendar listing
+        self._calendars_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+
+    def invalidate_calendars_cache(self) -> None:
+        """Drop the cached calendar listing, e.g. after calendars changed."""
+        self._calendars_cache = None
+
     def _get_caldav_base_path(self) -> str:
         """Helper to get the base CalDAV path for calendars."""
         return f"/remote.php/dav/calendars/{self.username}"
@@ -28,93 +226,96 @@ class CalendarClient(BaseNextcloudClient):
         return f"/remote.php/dav/principals/users/{self.username}"
 
     async def list_calendars(self) -> List[Dict[str, Any]]:
-        """List all available calendars for the user."""
+        """List all available calendars for the user.
+
+        Calendars rarely change, so the listing is cached for
+        `CALENDARS_TTL` seconds; creating or deleting a calendar through this
+        client invalidates it.
+        """
+        cached = self._calendars_cache
+        if cached and time.monotonic() - cached[0] < self.CALENDARS_TTL:
+            return [dict(calendar) for calendar in cached[1]]
+
+        calendars = await self._fetch_calendars()
+        self._calendars_cache = (time.monotonic(), calendars)
+        return [dict(calendar) for calendar in calendars]
+
+    async def _fetch_calendars(self) -> List[Dict[str, Any]]:
+        """PROPFIND the calendar home for its calendar collections."""
         caldav_path = self._get_caldav_base_path()
 
-        propfind_body = """<?xml version="1.0" encoding="utf-8"?>
-        <d:propfind xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav" xmlns:cs="http://calendarserver.org/ns/">
-            <d:prop>
-                <d:displayname/>
-                <d:resourcetype/>
-                <c:calendar-description/>
-                <cs:calendar-color/>
-                <c:supported-calendar-component-set/>
-            </d:prop>
-        </d:propfind>"""
-
-        headers = {
-            "Depth": "1",
-            "Content-Type": "application/xml",
-            "Accept": "application/xml",
-        }
-
         response = await self._make_request(
-            "PROPFIND", caldav_path, content=propfind_body, headers=headers
+            "PROPFIND",
+            caldav_path,
+            content=_CALENDARS_PROPFIND_BODY,
+            headers=_DAV_QUERY_HEADERS,
+            stream=True,
         )
 
-        # Parse XML response
-        root = ET.fromstring(response.content)
+        # Parse XML response as it arrives
         calendars = []
 
-        for response_elem in root.findall(".//{DAV:}response"):
-            href = response_elem.find(".//{DAV:}href")
-            if href is None:
-                continue
+        async with aclosing(iter_multistatus(response)) as responses:
+            async for response_elem in responses:
+                href = response_elem.find(_HREF_PATH)
+                if href is None:
+                    continue
 
-            href_text = href.text or ""
-            if not href_text.endswith("/"):
-                continue  # Skip non-calendar resources
+                href_text = href.text or ""
+                if not href_text.endswith("/"):
+                    continue  # Skip non-calendar resources
 
-            # Extract calendar name from href
-            calendar_name = href_text.rstrip("/").split("/")[-1]
-            if not calendar_name or calendar_name == self.username:
-                continue
+                # Extract calendar name from href
+                calendar_name = href_text.rstrip("/").split("/")[-1]
+                if not calendar_name or calendar_name == self.username:
+                    continue
 
-            # Get properties
-            propstat = response_elem.find(".//{DAV:}propstat")
-            if propstat is None:
-                continue
+                # Get properties
+                propstat = response_elem.find(_PROPSTAT_PATH)
+                if propstat is None:
+                    continue
 
-            prop = propstat.find(".//{DAV:}prop")
-            if prop is None:
-                continue
+                prop = propstat.find(_PROP_PATH)
+                if prop is None:
+                    continue
 
-            # Check if it's a calendar resource
-            resourcetype = prop.find(".//{DAV:}resourcetype")
-            is_calendar = (
-                resourcetype is not None
-                and resourcetype.find(".//{urn:ietf:params:xml:ns:caldav}calendar")
-                is not None
-            )
+                # Check if it's a calendar resource
+                resourcetype = prop.find(_RESOURCETYPE_PATH)
+                is_calendar = (
+                    resourcetype is not None
+                    and resourcetype.find(_CALENDAR_PATH) is not None
+                )
 
-            if not is_calendar:
-                continue
+                if not is_calendar:
+                    continue
 
-            # Extract calendar properties
-            displayname_elem = prop.find(".//{DAV:}displayname")
-            displayname = (
-                displayname_elem.text if displayname_elem is not None else calendar_name
-            )
+                # Extract calendar properties
+                displayname_elem = prop.find(_DISPLAYNAME_PATH)
+                displayname = (
+                    displayname_elem.text
+                    if displayname_elem is not None
+                    else calendar_name
+                )
 
-            description_elem = prop.find(
-                ".//{urn:ietf:params:xml:ns:caldav}calendar-description"
-            )
-            description = description_elem.text if description_elem is not None else ""
-
-            color_elem = prop.find(".//{http://calendarserver.org/ns/}calendar-color")
-            color = color_elem.text if color_elem is not None else "#1976D2"
-
-            calendars.append(
-                {
-                    "name": calendar_name,
-                    "display_name": displayname,
-                    "description": description,
-                    "color": color,
-                    "href": href_text,
-                }
-            )
+                description_elem = prop.find(_DESCRIPTION_PATH)
+                description = (
+                    description_elem.text if description_elem is not None else ""
+                )
+
+                color_elem = prop.find(_COLOR_PATH)
+                color = color_elem.text if color_elem is not None else "#1976D2"
 
-        logger.debug(f"Found {len(calendars)} calendars")
+                calendars.append(
+                    {
+                        "name": calendar_name,
+                        "display_name": displayname,
+                        "description": description,
+                        "color": color,
+                        "href": href_text,
+                    }
+                )
+
+        logger.debug("Found %s calendars", len(calendars))
         return calendars
 
     async def get_calendar_events(
@@ -123,8 +324,18 @@ class CalendarClient(BaseNextcloudClient):
         start_datetime: Optional[dt.datetime] = None,
         end_datetime: Optional[dt.datetime] = None,
         limit: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """List events in a calendar within date range."""
+        """List events in a calendar within date range.
+
+        The `title_contains` and `location_contains` entries of `filters` are
+        matched by the server (case-insensitive substring, as in
+        `_event_matches_filters`), other entries are ignored here. Invalid
+        filters raise ValueError.
+        """
+        if filters:
+            _validate_event_filters(filters)
+
         calendar_path = f"{self._get_caldav_base_path()}/{calendar_name}/"
 
         # Build time range filter if dates provided
@@ -141,66 +352,64 @@ class CalendarClient(BaseNextcloudClient):
                 if end_datetime
                 else "20301231T235959Z"
             )
-            time_range_filter = f"""
-                <c:time-range start="{start_dt}" end="{end_dt}"/>
-            """
-
-        report_body = f"""<?xml version="1.0" encoding="utf-8"?>
-        <c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
-            <d:prop>
-                <d:getetag/>
-                <c:calendar-data/>
-            </d:prop>
-            <c:filter>
-                <c:comp-filter name="VCALENDAR">
-                    <c:comp-filter name="VEVENT">
-                        {time_range_filter}
-                    </c:comp-filter>
-                </c:comp-filter>
-            </c:filter>
-        </c:calendar-query>"""
-
-        headers = {
-            "Depth": "1",
-            "Content-Type": "application/xml",
-            "Accept": "application/xml",
-        }
+            time_range_filter = _TIME_RANGE_FILTER.format(start=start_dt, end=end_dt)
+
+        # Text filters are pushed down to the server, so non-matching events
+        # are neither transferred nor parsed
+        prop_filters = "".join(
+            _TEXT_MATCH_FILTER.format(
+                name=prop_name, text=xml_escape(str(filters[key]))
+            )
+            for key, prop_name in _SERVER_TEXT_FILTERS
+            if filters and filters.get(key) not in (None, "")
+        )
+
+        report_body = _EVENTS_REPORT_BODY.format(
+            filters=time_range_filter + prop_filters
+        ).encode()
 
         response = await self._make_request(
-            "REPORT", calendar_path, content=report_body, headers=headers
+            "REPORT",
+            calendar_path,
+            content=report_body,
+            headers=_DAV_QUERY_HEADERS,
+            stream=True,
         )
 
-        # Parse XML response and extract events
-        root = ET.fromstring(response.content)
+        # Parse the XML response one event at a time as it arrives, events
+        # past the limit are neither read nor parsed
         events = []
 
-        for response_elem in root.findall(".//{DAV:}response"):
-            href = response_elem.find(".//{DAV:}href")
-            if href is None:
-                continue
+        async with aclosing(iter_multistatus(response)) as responses:
+            async for response_elem in responses:
+                href = response_elem.find(_HREF_PATH)
+                if href is None:
+                    continue
 
-            propstat = response_elem.find(".//{DAV:}propstat")
-            if propstat is None:
-                continue
+                propstat = response_elem.find(_PROPSTAT_PATH)
+                if propstat is None:
+                    continue
 
-            prop = propstat.find(".//{DAV:}prop")
-            if prop is None:
-                continue
+                prop = propstat.find(_PROP_PATH)
+                if prop is None:
+                    continue
 
-            calendar_data = prop.find(".//{urn:ietf:params:xml:ns:caldav}calendar-data")
-            etag_elem = prop.find(".//{DAV:}getetag")
+                calendar_data = prop.find(_CALENDAR_DATA_PATH)
+                etag_elem = prop.find(_GETETAG_PATH)
 
-            if calendar_data is not None and calendar_data.text:
-                event_data = self._parse_ical_event(calendar_data.text)
-                if event_data:
-                    event_data["href"] = href.text
-                    event_data["etag"] = etag_elem.text if etag_elem is not None else ""
-                    events.append(event_data)
+                if calendar_data is not None and calendar_data.text:
+                    event_data = self._parse_ical_event(calendar_data.text)
+                    if event_data:
+                        event_data["href"] = href.text
+                        event_data["etag"] = (
+                            etag_elem.text if etag_elem is not None else ""
+                        )
+                        events.append(event_data)
 
-            if len(events) >= limit:
-                break
+                if len(events) >= limit:
+                    break
 
-        logger.debug(f"Found {len(events)} events")
+        logger.debug("Found %s events", len(events))
         return events
 
     async def create_event(
@@ -214,16 +423,11 @@ class CalendarClient(BaseNextcloudClient):
         # Create iCalendar event
         ical_content = self._create_ical_event(event_data, event_uid)
 
-        headers = {
-            "Content-Type": "text/calendar; charset=utf-8",
-            "If-None-Match": "*",  # Ensure we're creating, not updating
-        }
-
         response = await self._make_request(
-            "PUT", event_path, content=ical_content, headers=headers
+            "PUT", event_path, content=ical_content, headers=_ICAL_CREATE_HEADERS
         )
 
-        logger.debug(f"Created event {event_uid}")
+        logger.debug("Created event %s", event_uid)
         return {
             "uid": event_uid,
             "href": event_path,
@@ -237,14 +441,26 @@ class CalendarClient(BaseNextcloudClient):
         event_uid: str,
         event_data: Dict[str, Any],
         etag: str = "",
+        existing_event_data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Update an existing calendar event while preserving all existing properties."""
+        """Update an existing calendar event while preserving all existing properties.
+
+        Without an `etag` the current iCalendar is fetched and merged with
+        `event_data`. Callers that already hold the parsed event (e.g. from
+        `get_calendar_events`) can pass it as `existing_event_data` to skip
+        that request; the event is then rebuilt from its parsed fields, so
+        properties these do not cover (such as alarms) are not kept. Its
+        `etag` is used unless one is given.
+        """
         event_filename = f"{event_uid}.ics"
         event_path = f"{self._get_caldav_base_path()}/{calendar_name}/{event_filename}"
 
+        if existing_event_data is not None:
+            etag = etag or existing_event_data.get("etag", "")
+
         # Get raw iCal content to preserve all properties including extended ones
         raw_ical_content = ""
-        if not etag:
+        if existing_event_data is None and not etag:
             try:
                 raw_ical_content, current_etag = await self._get_raw_ical(
                     calendar_name, event_uid
@@ -253,7 +469,7 @@ class CalendarClient(BaseNextcloudClient):
             except Exception:
                 # Fall back to creating new iCal if we can't get existing
                 logger.warning(
-                    f"Could not fetch existing iCal for {event_uid}, creating new"
+                    "Could not fetch existing iCal for %s, creating new", event_uid
                 )
                 raw_ical_content = ""
 
@@ -262,13 +478,15 @@ class CalendarClient(BaseNextcloudClient):
             ical_content = self._merge_ical_properties(
                 raw_ical_content, event_data, event_uid
             )
+        elif existing_event_data is not None:
+            ical_content = self._create_ical_event(
+                {**existing_event_data, **event_data}, event_uid
+            )
         else:
             # Fallback to creating new iCal if we couldn't get existing
             ical_content = self._create_ical_event(event_data, event_uid)
 
-        headers = {
-            "Content-Type": "text/calendar; charset=utf-8",
-        }
+        headers = {"Content-Type": _ICAL_CONTENT_TYPE}
         if etag:
             headers["If-Match"] = etag
 
@@ -277,7 +495,7 @@ class CalendarClient(BaseNextcloudClient):
                 "PUT", event_path, content=ical_content, headers=headers
             )
 
-            logger.debug(f"Updated event {event_uid}")
+            logger.debug("Updated event %s", event_uid)
             return {
                 "uid": event_uid,
                 "href": event_path,
@@ -286,10 +504,10 @@ class CalendarClient(BaseNextcloudClient):
             }
 
         except HTTPStatusError as e:
-            logger.error(f"HTTP error updating event: {e}")
+            logger.error("HTTP error updating event: %s", e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error updating event: {e}")
+            logger.error("Unexpected error updating event: %s", e)
             raise e
 
     async def delete_event(self, calendar_name: str, event_uid: str) -> Dict[str, Any]:
@@ -300,17 +518,17 @@ class CalendarClient(BaseNextcloudClient):
         try:
             response = await self._make_request("DELETE", event_path)
 
-            logger.debug(f"Deleted event {event_uid}")
+            logger.debug("Deleted event %s", event_uid)
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
             if e.response.status_code == 404:
-                logger.debug(f"Event {event_uid} not found")
+                logger.debug("Event %s not found", event_uid)
                 return {"status_code": 404}
-            logger.error(f"HTTP error deleting event: {e}")
+            logger.error("HTTP error deleting event: %s", e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error deleting event: {e}")
+            logger.error("Unexpected error deleting event: %s", e)
             raise e
 
     async def get_event(
@@ -320,10 +538,10 @@ class CalendarClient(BaseNextcloudClient):
         event_filename = f"{event_uid}.ics"
         event_path = f"{self._get_caldav_base_path()}/{calendar_name}/{event_filename}"
 
-        headers = {"Accept": "text/calendar"}
-
         try:
-            response = await self._make_request("GET", event_path, headers=headers)
+            response = await self._make_request(
+                "GET", event_path, headers=_ICAL_ACCEPT_HEADERS
+            )
 
             etag = response.headers.get("etag", "")
             event_data = self._parse_ical_event(response.text)
@@ -334,27 +552,32 @@ class CalendarClient(BaseNextcloudClient):
             event_data["href"] = event_path
             event_data["etag"] = etag
 
-            logger.debug(f"Retrieved event {event_uid}")
+            logger.debug("Retrieved event %s", event_uid)
             return event_data, etag
 
         except HTTPStatusError as e:
-            logger.error(f"HTTP error getting event: {e}")
+            logger.error("HTTP error getting event: %s", e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error getting event: {e}")
+            logger.error("Unexpected error getting event: %s", e)
             raise e
 
     def _create_ical_event(self, event_data: Dict[str, Any], event_uid: str) -> str:
-        """Create iCalendar content from event data."""
-        cal = Calendar()
-        cal.add("prodid", "-//NextCloud MCP Server//EN")
-        cal.add("version", "2.0")
-
-        event = ICalEvent()
-        event.add("uid", event_uid)
-        event.add("summary", event_data.get("title", ""))
-        event.add("description", event_data.get("description", ""))
-        event.add("location", event_data.get("location", ""))
+        """Create iCalendar content from event data.
+
+        The content lines are written directly rather than through icalendar
+        objects, which is considerably cheaper for a single event.
+        """
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//NextCloud MCP Server//EN",
+            "BEGIN:VEVENT",
+            f"UID:{_ical_escape(event_uid)}",
+            f"SUMMARY:{_ical_escape(event_data.get('title', ''))}",
+            f"DESCRIPTION:{_ical_escape(event_data.get('description', ''))}",
+            f"LOCATION:{_ical_escape(event_data.get('location', ''))}",
+        ]
 
         # Handle dates/times
         start_str = event_data.get("start_datetime", "")
@@ -364,72 +587,84 @@ class CalendarClient(BaseNextcloudClient):
         if start_str:  # Only parse if start_datetime is provided
             if all_day:
                 start_date = dt.datetime.fromisoformat(start_str.split("T")[0]).date()
-                event.add("dtstart", start_date)
+                lines.append(f"DTSTART;VALUE=DATE:{start_date:%Y%m%d}")
                 if end_str:
                     end_date = dt.datetime.fromisoformat(end_str.split("T")[0]).date()
-                    event.add("dtend", end_date)
+                    lines.append(f"DTEND;VALUE=DATE:{end_date:%Y%m%d}")
             else:
                 start_dt = dt.datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                event.add("dtstart", start_dt)
+                lines.append(f"DTSTART:{_ical_datetime(start_dt)}")
                 if end_str:
                     end_dt = dt.datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-                    event.add("dtend", end_dt)
+                    lines.append(f"DTEND:{_ical_datetime(end_dt)}")
 
         # Add categories
         categories = event_data.get("categories", "")
         if categories:
-            event.add("categories", categories.split(","))
-
-        # Add priority and status
-        priority = event_data.get("priority", 5)
-        event.add("priority", priority)
-
-        status = event_data.get("status", "CONFIRMED")
-        event.add("status", status)
+            lines.append(
+                "CATEGORIES:" + ",".join(map(_ical_escape, categories.split(",")))
+            )
 
-        # Add privacy classification
-        privacy = event_data.get("privacy", "PUBLIC")
-        event.add("class", privacy)
+        # Add priority, status and privacy classification
+        lines.append(f"PRIORITY:{int(event_data.get('priority', 5))}")
+        lines.append(f"STATUS:{_ical_escape(event_data.get('status', 'CONFIRMED'))}")
+        lines.append(f"CLASS:{_ical_escape(event_data.get('privacy', 'PUBLIC'))}")
 
         # Add URL
         url = event_data.get("url", "")
         if url:
-            event.add("url", url)
+            lines.append(f"URL:{url}")
 
-        # Handle recurrence
+        # Handle recurrence, validated and normalized by icalendar
         recurring = event_data.get("recurring", False)
         if recurring:
             recurrence_rule = event_data.get("recurrence_rule", "")
             if recurrence_rule:
-                event.add("rrule", vRecur.from_ical(recurrence_rule))
-
-        # Add alarms/reminders
-        reminder_minutes = event_data.get("reminder_minutes", 0)
-        if reminder_minutes > 0:
-            alarm = Alarm()
-            alarm.add("action", "DISPLAY")
-            alarm.add("description", "Event reminder")
-            alarm.add("trigger", dt.timedelta(minutes=-reminder_minutes))
-            event.add_component(alarm)
+                rrule = vRecur.from_ical(recurrence_rule).to_ical().decode()
+                lines.append(f"RRULE:{rrule}")
 
         # Add attendees
         attendees = event_data.get("attendees", "")
         if attendees:
             for email in attendees.split(","):
                 if email.strip():
-                    event.add("attendee", f"mailto:{email.strip()}")
+                    lines.append(f"ATTENDEE:mailto:{email.strip()}")
 
         # Add timestamps
-        now = dt.datetime.now(dt.UTC)
-        event.add("created", now)
-        event.add("dtstamp", now)
-        event.add("last-modified", now)
+        now = _ical_datetime(dt.datetime.now(dt.UTC))
+        lines += [f"CREATED:{now}", f"DTSTAMP:{now}", f"LAST-MODIFIED:{now}"]
 
-        cal.add_component(event)
-        return cal.to_ical().decode("utf-8")
+        # Add alarms/reminders
+        reminder_minutes = event_data.get("reminder_minutes", 0)
+        if reminder_minutes > 0:
+            trigger = vDuration(dt.timedelta(minutes=-reminder_minutes)).to_ical()
+            lines += [
+                "BEGIN:VALARM",
+                "ACTION:DISPLAY",
+                "DESCRIPTION:Event reminder",
+                f"TRIGGER:{trigger.decode()}",
+                "END:VALARM",
+            ]
+
+        lines += ["END:VEVENT", "END:VCALENDAR"]
+        return "\r\n".join(map(_fold_ical_line, lines)) + "\r\n"
 
     def _parse_ical_event(self, ical_text: str) -> Optional[Dict[str, Any]]:
-        """Parse iCalendar text and extract event data."""
+        """Parse iCalendar text and extract event data.
+
+        Events are read by scanning their content lines directly, which is
+        much cheaper than building the icalendar object tree. Anything the
+        scan does not handle (e.g. a time zone only defined in the calendar)
+        is parsed with icalendar instead.
+        """
+        try:
+            event_data = self._scan_ical_event(ical_text)
+        except ValueError as e:
+            logger.debug("Parsing iCalendar with icalendar: %s", e)
+        else:
+            if event_data is not None:
+                return event_data
+
         try:
             cal = Calendar.from_ical(ical_text)
             for component in cal.walk():
@@ -475,17 +710,16 @@ class CalendarClient(BaseNextcloudClient):
                     rrule = component.get("rrule")
                     if rrule:
                         event_data["recurring"] = True
-                        event_data["recurrence_rule"] = str(rrule)
+                        event_data["recurrence_rule"] = rrule.to_ical().decode()
 
                     # Handle attendees
                     attendees = []
-                    for attendee in component.get("attendee", []):
-                        if isinstance(attendee, list):
-                            attendees.extend(
-                                str(a).replace("mailto:", "") for a in attendee
-                            )
-                        else:
-                            attendees.append(str(attendee).replace("mailto:", ""))
+                    # A single attendee is not wrapped in a list
+                    attendee_prop = component.get("attendee", [])
+                    if not isinstance(attendee_prop, list):
+                        attendee_prop = [attendee_prop]
+                    for attendee in attendee_prop:
+                        attendees.append(str(attendee).replace("mailto:", ""))
                     if attendees:
                         event_data["attendees"] = ",".join(attendees)
 
@@ -494,27 +728,113 @@ class CalendarClient(BaseNextcloudClient):
             return None
 
         except Exception as e:
-            logger.error(f"Error parsing iCalendar: {e}")
+            logger.error("Error parsing iCalendar: %s", e)
             return None
 
+    def _scan_ical_event(self, ical_text: str) -> Optional[Dict[str, Any]]:
+        """Extract the first VEVENT of iCalendar text from its content lines.
+
+        Returns the same data as the icalendar based parsing in
+        `_parse_ical_event`, None if there is no event, and raises ValueError
+        for content it does not handle. Text is unescaped and categories are
+        split the way icalendar does it, and recurrence rules are normalized
+        by icalendar.
+        """
+        components: List[str] = []
+        props: Dict[str, Tuple[List[str], str]] = {}
+        categories: List[str] = []
+        attendees: List[str] = []
+
+        # Not str.splitlines(), which also breaks on characters such as
+        # U+2028 that may appear within a value
+        for line in _ICAL_LINE_BREAK_RE.split(_ICAL_FOLD_RE.sub("", ical_text)):
+            if not line:
+                continue
+            match = _ICAL_CONTENT_LINE_RE.fullmatch(line)
+            if match is None:
+                raise ValueError(f"Malformed content line: {line[:40]!r}")
+            name, *params = match.group(1).split(";")
+            name = name.upper()
+            value = match.group(2)
+
+            if name == "BEGIN":
+                components.append(value.upper())
+            elif name == "END":
+                if not components:
+                    raise ValueError(f"Unexpected END:{value}")
+                if components.pop() == "VEVENT":
+                    break
+            elif components and components[-1] == "VEVENT":
+                # Properties of nested components (VALARM) are skipped above
+                if name == "CATEGORIES":
+                    # As in icalendar, escaped commas separate categories too
+                    categories.extend(unescape_char(value).split(","))
+                elif name == "ATTENDEE":
+                    attendees.append(value.replace("mailto:", ""))
+                else:
+                    props.setdefault(name, (params, value))
+        else:
+            return None
+
+        def text(prop_name: str, default: str = "") -> str:
+            prop = props.get(prop_name)
+            return unescape_char(prop[1]) if prop else default
+
+        event_data: Dict[str, Any] = {
+            "uid": text("UID"),
+            "title": text("SUMMARY"),
+            "description": text("DESCRIPTION"),
+            "location": text("LOCATION"),
+            "status": text("STATUS", "CONFIRMED"),
+            "priority": int(props["PRIORITY"][1]) if "PRIORITY" in props else 5,
+            "privacy": text("CLASS", "PUBLIC"),
+            "url": text("URL"),
+        }
+
+        if "DTSTART" in props:
+            start = _ical_date_value(props["DTSTART"][1], props["DTSTART"][0])
+            event_data["start_datetime"] = start.isoformat()
+            event_data["all_day"] = not isinstance(start, dt.datetime)
+        if "DTEND" in props:
+            end = _ical_date_value(props["DTEND"][1], props["DTEND"][0])
+            event_data["end_datetime"] = end.isoformat()
+
+        if categories:
+            event_data["categories"] = ", ".join(categories)
+
+        if "RRULE" in props:
+            event_data["recurring"] = True
+            event_data["recurrence_rule"] = (
+                vRecur.from_ical(props["RRULE"][1]).to_ical().decode()
+            )
+
+        if attendees:
+            event_data["attendees"] = ",".join(attendees)
+
+        return event_data
+
     def _extract_categories(self, categories_obj) -> str:
         """Extract categories from icalendar object to string."""
         if not categories_obj:
             return ""
 
+        # Handle icalendar vCategory objects, whose 'cats' are usually strings
+        cats = getattr(categories_obj, "cats", None)
+        if cats is not None:
+            if cats and isinstance(cats[0], str):
+                return ", ".join(cats)
+            return ", ".join(map(str, cats))
+
+        if isinstance(categories_obj, str):
+            return categories_obj
+
+        if isinstance(categories_obj, list):
+            # Several CATEGORIES lines give one vCategory each
+            return ", ".join(map(self._extract_categories, categories_obj))
+
         try:
-            # Handle icalendar vCategory objects
-            if hasattr(categories_obj, "cats"):
-                # vCategory object has a 'cats' attribute that's a list
-                return ", ".join(str(cat) for cat in categories_obj.cats)
-            elif hasattr(categories_obj, "__iter__") and not isinstance(
-                categories_obj, str
-            ):
-                # Handle lists or other iterables
-                return ", ".join(str(cat) for cat in categories_obj)
-            else:
-                # Handle strings or other objects
-                return str(categories_obj)
+            # Handle other iterables
+            return ", ".join(str(cat) for cat in categories_obj)
         except Exception:
             # Fallback to string conversion
             return str(categories_obj)
@@ -525,45 +845,77 @@ class CalendarClient(BaseNextcloudClient):
         end_datetime: Optional[dt.datetime] = None,
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """Search events across all calendars with advanced filtering."""
+        """Search events across all calendars with advanced filtering.
+
+        Invalid filters raise ValueError before any calendar is searched,
+        rather than failing, and thereby skipping, every calendar.
+        """
+        if filters:
+            _validate_event_filters(filters)
+
         try:
             calendars = await self.list_calendars()
             all_events = []
 
-            for calendar in calendars:
-                try:
-                    events = await self.get_calendar_events(
-                        calendar["name"], start_datetime, end_datetime
+            # Fetch the calendars concurrently, a failing calendar is skipped
+            results = await gather_bounded(
+                (
+                    self.get_calendar_events(
+                        calendar["name"], start_datetime, end_datetime, filters=filters
                     )
+                    for calendar in calendars
+                ),
+                CALENDAR_FETCH_CONCURRENCY,
+                return_exceptions=True,
+            )
 
-                    # Apply filters if provided
-                    if filters:
-                        events = self._apply_event_filters(events, filters)
-
-                    # Add calendar info to each event
-                    for event in events:
-                        event["calendar_name"] = calendar["name"]
-                        event["calendar_display_name"] = calendar.get(
-                            "display_name", calendar["name"]
-                        )
-
-                    all_events.extend(events)
-                except Exception as e:
+            for calendar, events in zip(calendars, results):
+                if isinstance(events, Exception):
                     logger.warning(
-                        f"Error getting events from calendar {calendar['name']}: {e}"
+                        "Error getting events from calendar %s: %s",
+                        calendar["name"],
+                        events,
                     )
                     continue
 
+                # Apply filters if provided
+                if filters:
+                    events = self._apply_event_filters(events, filters)
+
+                # Add calendar info to each event
+                for event in events:
+                    event["calendar_name"] = calendar["name"]
+                    event["calendar_display_name"] = calendar.get(
+                        "display_name", calendar["name"]
+                    )
+
+                all_events.extend(events)
+
             return all_events
 
         except Exception as e:
-            logger.error(f"Error searching events across calendars: {e}")
+            logger.error("Error searching events across calendars: %s", e)
             raise
 
     def _apply_event_filters(
         self, events: List[Dict[str, Any]], filters: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Apply advanced filters to event list."""
+        """Apply advanced filters to event list.
+
+        Invalid filters raise ValueError rather than matching every event.
+        """
+        _validate_event_filters(filters)
+
+        # Normalize the filter values once instead of for every event
+        filters = dict(filters)
+        if "status" in filters:
+            filters["status"] = str(filters["status"]).upper()
+        for key in ("title_contains", "location_contains"):
+            if key in filters:
+                filters[key] = str(filters[key]).lower()
+        if "categories" in filters:
+            filters["categories"] = [str(cat).lower() for cat in filters["categories"]]
+
         filtered_events = []
 
         for event in events:
@@ -577,59 +929,54 @@ class CalendarClient(BaseNextcloudClient):
     def _event_matches_filters(
         self, event: Dict[str, Any], filters: Dict[str, Any]
     ) -> bool:
-        """Check if an event matches the provided filters."""
+        """Check if an event matches filters normalized by `_apply_event_filters`."""
         try:
+            # Cheap comparisons come first, the duration check parses dates
+
+            # Filter by status
+            if "status" in filters:
+                if event.get("status", "").upper() != filters["status"]:
+                    return False
+
+            # Filter by title contains
+            if "title_contains" in filters:
+                title = event.get("title", "").lower()
+                if filters["title_contains"] not in title:
+                    return False
+
+            # Filter by location contains
+            if "location_contains" in filters:
+                location = event.get("location", "").lower()
+                if filters["location_contains"] not in location:
+                    return False
+
             # Filter by minimum attendees
             if "min_attendees" in filters:
                 attendees = event.get("attendees", "")
-                attendee_count = len(attendees.split(",")) if attendees else 0
+                attendee_count = attendees.count(",") + 1 if attendees else 0
                 if attendee_count < filters["min_attendees"]:
                     return False
 
+            # Filter by categories
+            if "categories" in filters:
+                event_categories = event.get("categories", "").lower()
+                if not any(cat in event_categories for cat in filters["categories"]):
+                    return False
+
             # Filter by minimum duration
             if "min_duration_minutes" in filters:
                 start_str = event.get("start_datetime", "")
                 end_str = event.get("end_datetime", "")
                 if start_str and end_str:
                     try:
-                        start_dt = dt.datetime.fromisoformat(
-                            start_str.replace("Z", "+00:00")
-                        )
-                        end_dt = dt.datetime.fromisoformat(
-                            end_str.replace("Z", "+00:00")
-                        )
+                        start_dt = _event_datetime(start_str)
+                        end_dt = _event_datetime(end_str)
                         duration_minutes = (end_dt - start_dt).total_seconds() / 60
                         if duration_minutes < filters["min_duration_minutes"]:
                             return False
                     except Exception:
                         pass
 
-            # Filter by categories
-            if "categories" in filters:
-                event_categories = event.get("categories", "").lower()
-                required_categories = [cat.lower() for cat in filters["categories"]]
-                if not any(cat in event_categories for cat in required_categories):
-                    return False
-
-            # Filter by status
-            if "status" in filters:
-                if event.get("status", "").upper() != filters["status"].upper():
-                    return False
-
-            # Filter by title contains
-            if "title_contains" in filters:
-                title = event.get("title", "").lower()
-                search_term = filters["title_contains"].lower()
-                if search_term not in title:
-                    return False
-
-            # Filter by location contains
-            if "location_contains" in filters:
-                location = event.get("location", "").lower()
-                search_term = filters["location_contains"].lower()
-                if search_term not in location:
-                    return False
-
             return True
 
         except Exception:
@@ -647,10 +994,11 @@ class CalendarClient(BaseNextcloudClient):
         """Find available time slots for scheduling."""
         try:
             # Set default date range if not provided
+            now = dt.datetime.now()
             if not start_datetime:
-                start_datetime = dt.datetime.now()
+                start_datetime = now
             if not end_datetime:
-                end_datetime = dt.datetime.now() + dt.timedelta(days=7)
+                end_datetime = now + dt.timedelta(days=7)
 
             # Get all events in the date range
             busy_events = await self.search_events_across_calendars(
@@ -688,7 +1036,7 @@ class CalendarClient(BaseNextcloudClient):
             return available_slots
 
         except Exception as e:
-            logger.error(f"Error finding availability: {e}")
+            logger.error("Error finding availability: %s", e)
             raise
 
     def _generate_available_slots(
@@ -712,6 +1060,22 @@ class CalendarClient(BaseNextcloudClient):
                 hour=23, minute=59, second=59, microsecond=999999
             )
 
+            # Busy periods by day, so each event is parsed only once
+            busy_by_day: DefaultDict[dt.date, List[Tuple[dt.time, dt.time]]] = (
+                defaultdict(list)
+            )
+            for event in busy_events:
+                try:
+                    event_start = _event_datetime(event["start_datetime"])
+                    event_end = _event_datetime(event["end_datetime"])
+                except Exception:
+                    continue
+                busy_by_day[event_start.date()].append(
+                    (event_start.time(), event_end.time())
+                )
+            for day_busy_periods in busy_by_day.values():
+                day_busy_periods.sort()
+
             while current_date <= end_date_dt:
                 # Skip weekends if requested
                 if exclude_weekends and current_date.weekday() >= 5:
@@ -721,30 +1085,38 @@ class CalendarClient(BaseNextcloudClient):
                 # Generate slots for this day
                 day_slots = self._generate_day_slots(
                     current_date,
-                    busy_events,
+                    busy_by_day.get(current_date.date(), []),
                     duration_minutes,
                     business_hours_only,
                     preferred_times,
+                    max_slots=MAX_AVAILABLE_SLOTS - len(available_slots),
                 )
                 available_slots.extend(day_slots)
+                if len(available_slots) >= MAX_AVAILABLE_SLOTS:
+                    break
 
                 current_date += dt.timedelta(days=1)
 
-            return available_slots[:10]  # Limit to 10 slots
+            return available_slots
 
         except Exception as e:
-            logger.error(f"Error generating available slots: {e}")
+            logger.error("Error generating available slots: %s", e)
             return []
 
     def _generate_day_slots(
         self,
         date: dt.datetime,
-        busy_events: List[Dict[str, Any]],
+        day_busy_periods: List[Tuple[dt.time, dt.time]],
         duration_minutes: int,
         business_hours_only: bool,
         preferred_times: List[str],
+        max_slots: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Generate available slots for a specific day."""
+        """Generate available slots for a specific day, at most `max_slots`.
+
+        `day_busy_periods` are the sorted (start, end) times of the events
+        starting on this day.
+        """
         slots = []
 
         try:
@@ -754,26 +1126,6 @@ class CalendarClient(BaseNextcloudClient):
             else:
                 start_hour, end_hour = 8, 20
 
-            # Get busy periods for this day
-            day_busy_periods = []
-            for event in busy_events:
-                try:
-                    event_start = dt.datetime.fromisoformat(
-                        event["start_datetime"].replace("Z", "+00:00")
-                    )
-                    event_end = dt.datetime.fromisoformat(
-                        event["end_datetime"].replace("Z", "+00:00")
-                    )
-
-                    # Check if event is on this day
-                    if event_start.date() == date.date():
-                        day_busy_periods.append((event_start.time(), event_end.time()))
-                except Exception:
-                    continue
-
-            # Sort busy periods
-            day_busy_periods.sort()
-
             # Generate potential slots
             current_time = date.replace(
                 hour=start_hour, minute=0, second=0, microsecond=0
@@ -800,13 +1152,15 @@ class CalendarClient(BaseNextcloudClient):
                                 "date": date.date().isoformat(),
                             }
                         )
+                        if len(slots) == max_slots:
+                            break
 
                 current_time += dt.timedelta(minutes=30)  # 30-minute increments
 
             return slots
 
         except Exception as e:
-            logger.error(f"Error generating day slots: {e}")
+            logger.error("Error generating day slots: %s", e)
             return []
 
     def _slot_conflicts(self, slot_start, slot_end, busy_periods):
@@ -893,7 +1247,7 @@ class CalendarClient(BaseNextcloudClient):
             }
 
         except Exception as e:
-            logger.error(f"Error in bulk update: {e}")
+            logger.error("Error in bulk update: %s", e)
             raise
 
     async def create_calendar(
@@ -923,13 +1277,15 @@ class CalendarClient(BaseNextcloudClient):
                 </d:set>
             </mkcalendar>"""
 
-            headers = {"Content-Type": "application/xml", "Depth": "0"}
-
             response = await self._make_request(
-                "MKCALENDAR", calendar_path, content=mkcol_body, headers=headers
+                "MKCALENDAR",
+                calendar_path,
+                content=mkcol_body,
+                headers=_MKCALENDAR_HEADERS,
             )
+            self.invalidate_calendars_cache()
 
-            logger.debug(f"Created calendar: {calendar_name}")
+            logger.debug("Created calendar: %s", calendar_name)
             return {
                 "name": calendar_name,
                 "display_name": display_name or calendar_name,
@@ -939,7 +1295,7 @@ class CalendarClient(BaseNextcloudClient):
             }
 
         except Exception as e:
-            logger.error(f"Error creating calendar {calendar_name}: {e}")
+            logger.error("Error creating calendar %s: %s", calendar_name, e)
             raise
 
     async def delete_calendar(self, calendar_name: str) -> Dict[str, Any]:
@@ -948,12 +1304,13 @@ class CalendarClient(BaseNextcloudClient):
             calendar_path = f"{self._get_caldav_base_path()}/{calendar_name}/"
 
             response = await self._make_request("DELETE", calendar_path)
+            self.invalidate_calendars_cache()
 
-            logger.debug(f"Deleted calendar: {calendar_name}")
+            logger.debug("Deleted calendar: %s", calendar_name)
             return {"status_code": response.status_code}
 
         except Exception as e:
-            logger.error(f"Error deleting calendar {calendar_name}: {e}")
+            logger.error("Error deleting calendar %s: %s", calendar_name, e)
             raise
 
     async def _get_raw_ical(
@@ -963,14 +1320,14 @@ class CalendarClient(BaseNextcloudClient):
         event_filename = f"{event_uid}.ics"
         event_path = f"{self._get_caldav_base_path()}/{calendar_name}/{event_filename}"
 
-        headers = {"Accept": "text/calendar"}
-
         try:
-            response = await self._make_request("GET", event_path, headers=headers)
+            response = await self._make_request(
+                "GET", event_path, headers=_ICAL_ACCEPT_HEADERS
+            )
             etag = response.headers.get("etag", "")
             return response.text, etag
         except Exception as e:
-            logger.error(f"Error getting raw iCal for {event_uid}: {e}")
+            logger.error("Error getting raw iCal for %s: %s", event_uid, e)
             raise
 
     def _merge_ical_properties(
@@ -1071,6 +1428,6 @@ class CalendarClient(BaseNextcloudClient):
             return cal.to_ical().decode("utf-8")
 
         except Exception as e:
-            logger.error(f"Error merging iCal properties: {e}")
+            logger.error("Error merging iCal properties: %s", e)
             # Fallback to creating new iCal
             return self._create_ical_event(event_data, event_uid)
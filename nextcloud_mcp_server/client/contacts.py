@@ -7,6 +7,16 @@ from pythonvCard4.vcard import Contact
 
 logger = logging.getLogger(__name__)
 
+# Static request headers, httpx copies them per request
+_XML_HEADERS = {
+    "Content-Type": "application/xml",
+    "Accept": "application/xml",
+}
+_DAV_QUERY_HEADERS = {"Depth": "1", **_XML_HEADERS}
+_MKCOL_HEADERS = {"Content-Type": "application/xml"}
+_VCARD_CONTENT_TYPE = "text/vcard; charset=utf-8"
+_VCARD_CREATE_HEADERS = {"Content-Type": _VCARD_CONTENT_TYPE, "If-None-Match": "*"}
+
 
 class ContactsClient(BaseNextcloudClient):
     """Client for NextCloud CardDAV contact operations."""
@@ -28,14 +38,8 @@ class ContactsClient(BaseNextcloudClient):
             </d:prop>
         </d:propfind>"""
 
-        headers = {
-            # "Depth": "0",
-            "Content-Type": "application/xml",
-            "Accept": "application/xml",
-        }
-
         response = await self._make_request(
-            "PROPFIND", carddav_path, content=propfind_body, headers=headers
+            "PROPFIND", carddav_path, content=propfind_body, headers=_XML_HEADERS
         )
 
         ns = {"d": "DAV:"}
@@ -84,7 +88,7 @@ class ContactsClient(BaseNextcloudClient):
                 }
             )
 
-        logger.debug(f"Found {len(addressbooks)} addressbooks")
+        logger.debug("Found %s addressbooks", len(addressbooks))
         return addressbooks
 
     async def create_addressbook(self, *, name: str, display_name: str):
@@ -105,11 +109,9 @@ class ContactsClient(BaseNextcloudClient):
             </d:set>
         </d:mkcol>"""
 
-        headers = {
-            "Content-Type": "application/xml",
-        }
-
-        await self._make_request("MKCOL", url, content=prop_body, headers=headers)
+        await self._make_request(
+            "MKCOL", url, content=prop_body, headers=_MKCOL_HEADERS
+        )
 
     async def delete_addressbook(self, *, name: str):
         """Delete an addressbook."""
@@ -130,12 +132,9 @@ class ContactsClient(BaseNextcloudClient):
 
         vcard = contact.to_vcard()
 
-        headers = {
-            "Content-Type": "text/vcard; charset=utf-8",
-            "If-None-Match": "*",
-        }
-
-        await self._make_request("PUT", url, content=vcard, headers=headers)
+        await self._make_request(
+            "PUT", url, content=vcard, headers=_VCARD_CREATE_HEADERS
+        )
 
     async def delete_contact(self, *, addressbook: str, uid: str):
         """Delete a contact."""
@@ -161,7 +160,7 @@ class ContactsClient(BaseNextcloudClient):
             except Exception:
                 # Fall back to creating new vCard if we can't get existing
                 logger.warning(
-                    f"Could not fetch existing vCard for {uid}, creating new"
+                    "Could not fetch existing vCard for %s, creating new", uid
                 )
                 raw_vcard_content = ""
 
@@ -179,9 +178,7 @@ class ContactsClient(BaseNextcloudClient):
                 contact.tel = [{"value": contact_data["tel"], "type": ["HOME"]}]
             vcard_content = contact.to_vcard()
 
-        headers = {
-            "Content-Type": "text/vcard; charset=utf-8",
-        }
+        headers = {"Content-Type": _VCARD_CONTENT_TYPE}
         if etag:
             headers["If-Match"] = etag
 
@@ -200,17 +197,11 @@ class ContactsClient(BaseNextcloudClient):
             </d:prop>
         </card:addressbook-query>"""
 
-        headers = {
-            "Depth": "1",
-            "Content-Type": "application/xml",
-            "Accept": "application/xml",
-        }
-
         response = await self._make_request(
             "REPORT",
             f"{carddav_path}/{addressbook}",
             content=report_body,
-            headers=headers,
+            headers=_DAV_QUERY_HEADERS,
         )
 
         ns = {"d": "DAV:", "card": "urn:ietf:params:xml:ns:carddav"}
@@ -275,7 +266,7 @@ class ContactsClient(BaseNextcloudClient):
                 }
             )
 
-        logger.debug(f"Found {len(contacts)} contacts")
+        logger.debug("Found %s contacts", len(contacts))
         return contacts
 
     async def _get_raw_vcard(self, addressbook: str, uid: str) -> tuple[str, str]:
@@ -288,7 +279,7 @@ class ContactsClient(BaseNextcloudClient):
             etag = response.headers.get("etag", "")
             return response.text, etag
         except Exception as e:
-            logger.error(f"Error getting raw vCard for {uid}: {e}")
+            logger.error("Error getting raw vCard for %s: %s", uid, e)
             raise
 
     def _merge_vcard_properties(
@@ -420,7 +411,7 @@ class ContactsClient(BaseNextcloudClient):
             return "\n".join(updated_lines)
 
         except Exception as e:
-            logger.error(f"Error merging vCard properties: {e}")
+            logger.error("Error merging vCard properties: %s", e)
             # Fallback to creating basic vCard matching Nextcloud format
             basic_vcard = f"""BEGIN:VCARD
 VERSION:3.0
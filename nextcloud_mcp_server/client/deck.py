@@ -1,6 +1,10 @@
 from typing import List, Optional, Dict, Any
 
-from nextcloud_mcp_server.client.base import BaseNextcloudClient
+from nextcloud_mcp_server.client.base import (
+    OCS_JSON_HEADERS,
+    BaseNextcloudClient,
+    decode_json,
+)
 from nextcloud_mcp_server.models.deck import (
     DeckBoard,
     DeckStack,
@@ -38,7 +42,7 @@ class DeckClient(BaseNextcloudClient):
         response = await self._make_request(
             "GET", "/apps/deck/api/v1.0/boards", headers=headers, params=params
         )
-        return [DeckBoard(**board) for board in response.json()]
+        return [DeckBoard(**board) for board in decode_json(response)]
 
     async def create_board(self, title: str, color: str) -> DeckBoard:
         json_data = {"title": title, "color": color}
@@ -46,14 +50,14 @@ class DeckClient(BaseNextcloudClient):
         response = await self._make_request(
             "POST", "/apps/deck/api/v1.0/boards", json=json_data, headers=headers
         )
-        return DeckBoard(**response.json())
+        return DeckBoard(**decode_json(response))
 
     async def get_board(self, board_id: int) -> DeckBoard:
         headers = self._get_deck_headers()
         response = await self._make_request(
             "GET", f"/apps/deck/api/v1.0/boards/{board_id}", headers=headers
         )
-        return DeckBoard(**response.json())
+        return DeckBoard(**decode_json(response))
 
     async def update_board(
         self,
@@ -110,7 +114,7 @@ class DeckClient(BaseNextcloudClient):
         response = await self._make_request(
             "POST", f"/apps/deck/api/v1.0/boards/{board_id}/acl", json=json_data
         )
-        return [DeckACL(**acl) for acl in response.json()]
+        return [DeckACL(**acl) for acl in decode_json(response)]
 
     async def update_acl_rule(
         self,
@@ -157,7 +161,7 @@ class DeckClient(BaseNextcloudClient):
         response = await self._make_request(
             "POST", f"/apps/deck/api/v1.0/boards/{board_id}/clone", json=json_data
         )
-        return DeckBoard(**response.json())
+        return DeckBoard(**decode_json(response))
 
     # Stacks
     async def get_stacks(
@@ -170,19 +174,19 @@ class DeckClient(BaseNextcloudClient):
         response = await self._make_request(
             "GET", f"/apps/deck/api/v1.0/boards/{board_id}/stacks", headers=headers
         )
-        return [DeckStack(**stack) for stack in response.json()]
+        return [DeckStack(**stack) for stack in decode_json(response)]
 
     async def get_archived_stacks(self, board_id: int) -> List[DeckStack]:
         response = await self._make_request(
             "GET", f"/apps/deck/api/v1.0/boards/{board_id}/stacks/archived"
         )
-        return [DeckStack(**stack) for stack in response.json()]
+        return [DeckStack(**stack) for stack in decode_json(response)]
 
     async def get_stack(self, board_id: int, stack_id: int) -> DeckStack:
         response = await self._make_request(
             "GET", f"/apps/deck/api/v1.0/boards/{board_id}/stacks/{stack_id}"
         )
-        return DeckStack(**response.json())
+        return DeckStack(**decode_json(response))
 
     async def create_stack(self, board_id: int, title: str, order: int) -> DeckStack:
         json_data = {"title": title, "order": order}
@@ -193,7 +197,7 @@ class DeckClient(BaseNextcloudClient):
             json=json_data,
             headers=headers,
         )
-        return DeckStack(**response.json())
+        return DeckStack(**decode_json(response))
 
     async def update_stack(
         self,
@@ -228,7 +232,7 @@ class DeckClient(BaseNextcloudClient):
             f"/apps/deck/api/v1.0/boards/{board_id}/stacks/{stack_id}/cards/{card_id}",
             headers=headers,
         )
-        return DeckCard(**response.json())
+        return DeckCard(**decode_json(response))
 
     async def create_card(
         self,
@@ -256,7 +260,7 @@ class DeckClient(BaseNextcloudClient):
             json=json_data,
             headers=headers,
         )
-        return DeckCard(**response.json())
+        return DeckCard(**decode_json(response))
 
     async def update_card(
         self,
@@ -393,7 +397,7 @@ class DeckClient(BaseNextcloudClient):
             f"/apps/deck/api/v1.0/boards/{board_id}/labels/{label_id}",
             headers=headers,
         )
-        return DeckLabel(**response.json())
+        return DeckLabel(**decode_json(response))
 
     async def create_label(self, board_id: int, title: str, color: str) -> DeckLabel:
         json_data = {"title": title, "color": color}
@@ -404,7 +408,7 @@ class DeckClient(BaseNextcloudClient):
             json=json_data,
             headers=headers,
         )
-        return DeckLabel(**response.json())
+        return DeckLabel(**decode_json(response))
 
     async def update_label(
         self,
@@ -437,7 +441,7 @@ class DeckClient(BaseNextcloudClient):
             "GET",
             f"/apps/deck/api/v1.0/boards/{board_id}/stacks/{stack_id}/cards/{card_id}/attachments",
         )
-        return [DeckAttachment(**attachment) for attachment in response.json()]
+        return [DeckAttachment(**attachment) for attachment in decode_json(response)]
 
     async def get_attachment_file(
         self, board_id: int, stack_id: int, card_id: int, attachment_id: int
@@ -467,7 +471,7 @@ class DeckClient(BaseNextcloudClient):
             params=params,
             data=file_data,
         )
-        return DeckAttachment(**response.json())
+        return DeckAttachment(**decode_json(response))
 
     async def update_attachment(
         self,
@@ -487,7 +491,7 @@ class DeckClient(BaseNextcloudClient):
             params=params,
             data=file_data,
         )
-        return DeckAttachment(**response.json())
+        return DeckAttachment(**decode_json(response))
 
     async def delete_attachment(
         self, board_id: int, stack_id: int, card_id: int, attachment_id: int
@@ -507,11 +511,11 @@ class DeckClient(BaseNextcloudClient):
 
     # OCS API Endpoints (Config, Comments, Sessions)
     async def get_config(self) -> DeckConfig:
-        headers = {"OCS-APIRequest": "true", "Accept": "application/json"}
+        headers = OCS_JSON_HEADERS
         response = await self._make_request(
             "GET", "/ocs/v2.php/apps/deck/api/v1.0/config", headers=headers
         )
-        return DeckConfig(**response.json()["ocs"]["data"])
+        return DeckConfig(**decode_json(response)["ocs"]["data"])
 
     async def set_config_value(
         self, key: str, value: Any, board_id: Optional[int] = None
@@ -524,9 +528,9 @@ class DeckClient(BaseNextcloudClient):
             "POST",
             path,
             json=json_data,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
-        return response.json()["ocs"]["data"]
+        return decode_json(response)["ocs"]["data"]
 
     async def get_comments(
         self, card_id: int, limit: int = 20, offset: int = 0
@@ -536,9 +540,11 @@ class DeckClient(BaseNextcloudClient):
             "GET",
             f"/ocs/v2.php/apps/deck/api/v1.0/cards/{card_id}/comments",
             params=params,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
-        return [DeckComment(**comment) for comment in response.json()["ocs"]["data"]]
+        return [
+            DeckComment(**comment) for comment in decode_json(response)["ocs"]["data"]
+        ]
 
     async def create_comment(
         self, card_id: int, message: str, parent_id: Optional[int] = None
@@ -550,9 +556,9 @@ class DeckClient(BaseNextcloudClient):
             "POST",
             f"/ocs/v2.php/apps/deck/api/v1.0/cards/{card_id}/comments",
             json=json_data,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
-        return DeckComment(**response.json()["ocs"]["data"])
+        return DeckComment(**decode_json(response)["ocs"]["data"])
 
     async def update_comment(
         self, card_id: int, comment_id: int, message: str
@@ -562,15 +568,15 @@ class DeckClient(BaseNextcloudClient):
             "PUT",
             f"/ocs/v2.php/apps/deck/api/v1.0/cards/{card_id}/comments/{comment_id}",
             json=json_data,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
-        return DeckComment(**response.json()["ocs"]["data"])
+        return DeckComment(**decode_json(response)["ocs"]["data"])
 
     async def delete_comment(self, card_id: int, comment_id: int) -> None:
         await self._make_request(
             "DELETE",
             f"/ocs/v2.php/apps/deck/api/v1.0/cards/{card_id}/comments/{comment_id}",
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
 
     async def create_session(self, board_id: int) -> DeckSession:
@@ -579,9 +585,9 @@ class DeckClient(BaseNextcloudClient):
             "PUT",
             "/ocs/v2.php/apps/deck/api/v1.0/session/create",
             json=json_data,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
-        return DeckSession(**response.json()["ocs"]["data"])
+        return DeckSession(**decode_json(response)["ocs"]["data"])
 
     async def sync_session(self, board_id: int, token: str) -> None:
         json_data = {"boardId": board_id, "token": token}
@@ -589,7 +595,7 @@ class DeckClient(BaseNextcloudClient):
             "POST",
             "/ocs/v2.php/apps/deck/api/v1.0/session/sync",
             json=json_data,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
 
     async def close_session(self, board_id: int, token: str) -> None:
@@ -598,5 +604,5 @@ class DeckClient(BaseNextcloudClient):
             "POST",
             "/ocs/v2.php/apps/deck/api/v1.0/session/close",
             json=json_data,
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
@@ -1,45 +1,221 @@
 """Client for Nextcloud Notes app operations."""
 
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from .base import BaseNextcloudClient
+from httpx import AsyncClient, HTTPStatusError, codes
+
+from .base import BaseNextcloudClient, decode_json, gather_bounded
 
 logger = logging.getLogger(__name__)
 
+# Number of recently seen notes remembered to detect no-op updates
+SEEN_NOTES_CACHE_SIZE = 128
+
+# Number of metadata listings (per exclude and category) kept for revalidation
+LISTING_CACHE_SIZE = 128
+
+_NOTES_API = "/apps/notes/api/v1"
+
+# Requests sent at the same time by the bulk methods (`get_notes`,
+# `create_notes`, `update_notes`)
+NOTES_BULK_CONCURRENCY = 32
+
+
+def _quote_etag(etag: str) -> str:
+    return etag if etag.startswith('"') else f'"{etag}"'
+
+
+def _if_match(etag: str) -> Dict[str, str]:
+    """Build an If-Match header, quoting the etag unless it already is."""
+    return {"If-Match": _quote_etag(etag)}
+
+
+def _content_digest(content: str) -> bytes:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
 
 class NotesClient(BaseNextcloudClient):
     """Client for Nextcloud Notes app operations."""
 
+    def __init__(self, http_client: AsyncClient, username: str):
+        super().__init__(http_client, username)
+        # note id -> (content digest, note) as last seen
+        self._seen_notes: OrderedDict[int, Tuple[bytes, Dict[str, Any]]] = OrderedDict()
+        # (exclude, category) parameters -> (etag, notes) of the last
+        # metadata listing
+        self._listing_cache: OrderedDict[
+            Tuple[str, Optional[str]], Tuple[str, List[Dict[str, Any]]]
+        ] = OrderedDict()
+        # Metadata listings in flight, shared by concurrent callers
+        self._listing_requests: Dict[
+            Tuple[str, Optional[str]], asyncio.Future[List[Dict[str, Any]]]
+        ] = {}
+
+    def _remember_note(self, note: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the version of a note returned by the server."""
+        if "id" in note and "content" in note:
+            self._seen_notes[note["id"]] = (
+                _content_digest(note["content"]),
+                dict(note),
+            )
+            self._seen_notes.move_to_end(note["id"])
+            if len(self._seen_notes) > SEEN_NOTES_CACHE_SIZE:
+                self._seen_notes.popitem(last=False)
+        return note
+
+    def _unchanged_note(
+        self, note_id: int, etag: str, body: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the note if applying `body` at `etag` would not change it."""
+        seen = self._seen_notes.get(note_id)
+        if seen is None or "content" not in body:
+            return None
+        digest, note = seen
+        if note.get("etag") != etag or _content_digest(body["content"]) != digest:
+            return None
+        if any(
+            body[field] != note.get(field)
+            for field in ("title", "category")
+            if field in body
+        ):
+            return None
+        return dict(note)
+
     async def get_settings(self) -> Dict[str, Any]:
         """Get Notes app settings."""
-        response = await self._make_request("GET", "/apps/notes/api/v1/settings")
-        return response.json()
+        response = await self._make_request("GET", f"{_NOTES_API}/settings")
+        return decode_json(response)
+
+    async def get_all_notes(
+        self, exclude: Optional[str] = None, category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all notes.
+
+        Args:
+            exclude: Comma-separated note fields to leave out of the response,
+                e.g. "content" to list only metadata
+            category: Only list notes in this category, filtered by the server
+        """
+        if exclude and "content" in exclude.split(","):
+            return await self._get_notes_metadata(exclude, category)
 
-    async def get_all_notes(self) -> List[Dict[str, Any]]:
-        """Get all notes."""
         notes = []
         cursor = ""
+        params = {"chunkSize": 50}
+        if exclude:
+            params["exclude"] = exclude
+        if category is not None:
+            params["category"] = category
 
         while True:
             response = await self._make_request(
                 "GET",
-                "/apps/notes/api/v1/notes",
-                params={"chunkSize": 50, "chunkCursor": cursor},
+                f"{_NOTES_API}/notes",
+                params={**params, "chunkCursor": cursor},
             )
-            notes.extend(response.json())
+            notes.extend(decode_json(response))
             if "X-Notes-Chunk-Cursor" not in response.headers:
                 break
             cursor = response.headers["X-Notes-Chunk-Cursor"]
 
         return notes
 
+    async def _get_notes_metadata(
+        self, exclude: str, category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """List notes without their content in a single request.
+
+        Such listings are small, so they are not paginated. The last listing
+        is revalidated with its ETag, an unchanged one costs only a `304`.
+        Concurrent calls with the same parameters share one request.
+        """
+        key = (exclude, category)
+        request = self._listing_requests.get(key)
+        if request is None:
+            request = asyncio.ensure_future(
+                self._fetch_notes_metadata(exclude, category)
+            )
+            self._listing_requests[key] = request
+            request.add_done_callback(
+                lambda done: self._listing_request_done(key, done)
+            )
+        # Shielded, so a cancelled caller does not cancel the shared request.
+        # The listed notes are shared with the cache and other callers, so
+        # each caller gets its own copies
+        return [dict(note) for note in await asyncio.shield(request)]
+
+    def _listing_request_done(
+        self,
+        key: Tuple[str, Optional[str]],
+        request: asyncio.Future[List[Dict[str, Any]]],
+    ) -> None:
+        self._listing_requests.pop(key, None)
+        # Retrieve the error, the callers that awaited the request have
+        # already seen it and all of them may have been cancelled
+        if not request.cancelled():
+            request.exception()
+
+    async def _fetch_notes_metadata(
+        self, exclude: str, category: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        headers = {}
+        cached = self._listing_cache.get((exclude, category))
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        params = {"exclude": exclude}
+        if category is not None:
+            params["category"] = category
+        response = await self._make_request(
+            "GET", f"{_NOTES_API}/notes", params=params, headers=headers
+        )
+        if cached and response.status_code == codes.NOT_MODIFIED:
+            logger.debug("Notes listing not modified, using cached listing")
+            self._listing_cache.move_to_end((exclude, category))
+            return cached[1]
+
+        notes = decode_json(response)
+        etag = response.headers.get("etag")
+        if etag:
+            self._listing_cache[(exclude, category)] = (etag, notes)
+            self._listing_cache.move_to_end((exclude, category))
+            if len(self._listing_cache) > LISTING_CACHE_SIZE:
+                self._listing_cache.popitem(last=False)
+        return notes
+
     async def get_note(self, note_id: int) -> Dict[str, Any]:
-        """Get a specific note by ID."""
+        """Get a specific note by ID.
+
+        A recently seen note is revalidated with its etag, so an unchanged
+        note costs only a `304` and is not decoded again.
+        """
+        headers = {}
+        seen = self._seen_notes.get(note_id)
+        if seen is not None and seen[1].get("etag"):
+            headers["If-None-Match"] = _quote_etag(seen[1]["etag"])
+
         response = await self._make_request(
-            "GET", f"/apps/notes/api/v1/notes/{note_id}"
+            "GET", f"{_NOTES_API}/notes/{note_id}", headers=headers
+        )
+        if seen is not None and response.status_code == codes.NOT_MODIFIED:
+            logger.debug("Note %s not modified, using last seen version", note_id)
+            self._seen_notes.move_to_end(note_id)
+            return dict(seen[1])
+        return self._remember_note(decode_json(response))
+
+    async def get_notes(self, note_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get several notes by ID, in the given order.
+
+        The notes are fetched concurrently, at most `NOTES_BULK_CONCURRENCY`
+        at a time, so the requests share connections instead of queuing.
+        """
+        return await gather_bounded(
+            map(self.get_note, note_ids), NOTES_BULK_CONCURRENCY
         )
-        return response.json()
 
     async def create_note(
         self,
@@ -48,18 +224,35 @@ class NotesClient(BaseNextcloudClient):
         category: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Create a new note."""
-        body = {}
-        if title:
-            body["title"] = title
-        if content:
-            body["content"] = content
-        if category:
-            body["category"] = category
-
-        response = await self._make_request(
-            "POST", "/apps/notes/api/v1/notes", json=body
+        # Unlike updates, empty values are left out and use the server defaults
+        body = {
+            field: value
+            for field, value in (
+                ("title", title),
+                ("content", content),
+                ("category", category),
+            )
+            if value
+        }
+
+        response = await self._make_request("POST", f"{_NOTES_API}/notes", json=body)
+        return self._remember_note(decode_json(response))
+
+    async def create_notes(
+        self, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any] | Exception]:
+        """Create several notes concurrently, each item holding the keyword
+        arguments of `create_note`.
+
+        Results are returned in the order of `items`; a note that could not
+        be created is represented by its exception instead of failing the
+        others.
+        """
+        return await gather_bounded(
+            (self.create_note(**item) for item in items),
+            NOTES_BULK_CONCURRENCY,
+            return_exceptions=True,
         )
-        return response.json()
 
     async def update(
         self,
@@ -69,44 +262,68 @@ class NotesClient(BaseNextcloudClient):
         content: Optional[str] = None,
         category: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Update an existing note."""
-        # Get current note details to check for category change
+        """Update an existing note.
+
+        If the note was last seen at `etag` with the same title, content and
+        category, it is only revalidated with a conditional GET (a `304`
+        when unchanged) instead of being written again. A note that changed
+        or was deleted on the server still fails, as the PUT would.
+        """
+        # Prepare update body, empty strings are sent as given (e.g. an empty
+        # category moves the note out of its category)
+        body = {
+            field: value
+            for field, value in (
+                ("title", title),
+                ("content", content),
+                ("category", category),
+            )
+            if value is not None
+        }
+
+        if self._unchanged_note(note_id, etag, body) is not None:
+            # A changed note replaces the seen version and is updated below,
+            # where the stale etag is rejected
+            await self.get_note(note_id)
+            unchanged = self._unchanged_note(note_id, etag, body)
+            if unchanged is not None:
+                logger.info("Note %s is unchanged, skipping update", note_id)
+                return unchanged
+
+        # Get current note details to check for category change. A note seen
+        # with this etag is what the server holds if the PUT succeeds, so its
+        # category can be used without fetching the note again
         old_note = None
         try:
             if category is not None:
-                old_note = await self.get_note(note_id)
+                seen = self._seen_notes.get(note_id)
+                if seen is not None and seen[1].get("etag") == etag:
+                    old_note = seen[1]
+                else:
+                    old_note = await self.get_note(note_id)
                 old_category = old_note.get("category", "")
-                logger.info(f"Current category for note {note_id}: '{old_category}'")
+                logger.info("Current category for note %s: '%s'", note_id, old_category)
         except Exception as e:
             logger.warning(
-                f"Could not fetch current note {note_id} details before update: {e}"
+                "Could not fetch current note %s details before update: %s", note_id, e
             )
             old_note = None
 
-        # Prepare update body
-        body = {}
-        if title:
-            body["title"] = title
-        if content:
-            body["content"] = content
-        if category:
-            body["category"] = category
-
-        logger.info(
-            f"Attempting to update note {note_id} with etag {etag}. Body: {body}"
-        )
+        logger.info("Attempting to update note %s with etag %s", note_id, etag)
+        # The body holds the full note content, only log it when debugging
+        logger.debug("Update body for note %s: %s", note_id, body)
 
         response = await self._make_request(
             "PUT",
-            f"/apps/notes/api/v1/notes/{note_id}",
+            f"{_NOTES_API}/notes/{note_id}",
             json=body,
-            headers={"If-Match": f'"{etag}"'},
+            headers=_if_match(etag),
         )
 
         logger.info(
-            f"Update response for note {note_id}: Status {response.status_code}"
+            "Update response for note %s: Status %s", note_id, response.status_code
         )
-        updated_note = response.json()
+        updated_note = self._remember_note(decode_json(response))
 
         # Check for category change and cleanup old attachment directory if needed
         if (
@@ -115,7 +332,9 @@ class NotesClient(BaseNextcloudClient):
             and old_note.get("category", "") != category
         ):
             logger.info(
-                f"Category changed from '{old_note.get('category', '')}' to '{category}' - cleaning up old attachment directory"
+                "Category changed from '%s' to '%s' - cleaning up old attachment directory",
+                old_note.get("category", ""),
+                category,
             )
             try:
                 # Import here to avoid circular imports
@@ -127,11 +346,28 @@ class NotesClient(BaseNextcloudClient):
                 )
             except Exception as e:
                 logger.error(
-                    f"Error cleaning up old attachment directory for note {note_id}: {e}"
+                    "Error cleaning up old attachment directory for note %s: %s",
+                    note_id,
+                    e,
                 )
 
         return updated_note
 
+    async def update_notes(
+        self, items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any] | Exception]:
+        """Update several notes concurrently, each item holding the keyword
+        arguments of `update`.
+
+        Results are returned in the order of `items`, with the exception in
+        place of a note that could not be updated (e.g. a stale etag).
+        """
+        return await gather_bounded(
+            (self.update(**item) for item in items),
+            NOTES_BULK_CONCURRENCY,
+            return_exceptions=True,
+        )
+
     async def delete_note(self, note_id: int) -> Dict[str, Any]:
         """Delete a note and its attachments."""
         # Fetch note details first to get category for cleanup
@@ -147,21 +383,23 @@ class NotesClient(BaseNextcloudClient):
                 potential_categories.append("")  # Empty category
 
             logger.info(
-                f"Note {note_id} has category: '{category}', will check attachment directories in: {potential_categories}"
+                "Note %s has category: '%s', will check attachment directories in: %s",
+                note_id,
+                category,
+                potential_categories,
             )
         except Exception as e:
             logger.warning(
-                f"Could not fetch note {note_id} details before deletion: {e}"
+                "Could not fetch note %s details before deletion: %s", note_id, e
             )
             potential_categories = ["", "Unknown"]  # Try common categories
 
         # Delete the note via API
-        logger.info(f"Deleting note {note_id} via API")
-        response = await self._make_request(
-            "DELETE", f"/apps/notes/api/v1/notes/{note_id}"
-        )
-        logger.info(f"Note {note_id} deleted successfully via API")
-        json_response = response.json()
+        logger.info("Deleting note %s via API", note_id)
+        response = await self._make_request("DELETE", f"{_NOTES_API}/notes/{note_id}")
+        logger.info("Note %s deleted successfully via API", note_id)
+        self._seen_notes.pop(note_id, None)
+        json_response = decode_json(response)
 
         # Clean up attachment directories
         try:
@@ -169,42 +407,73 @@ class NotesClient(BaseNextcloudClient):
 
             webdav_client = WebDAVClient(self._client, self.username)
 
-            for cat in potential_categories:
-                try:
-                    await webdav_client.cleanup_note_attachments(note_id, cat)
-                except Exception as e:
+            # The candidate directories are independent, delete them concurrently
+            results = await asyncio.gather(
+                *(
+                    webdav_client.cleanup_note_attachments(note_id, cat)
+                    for cat in potential_categories
+                ),
+                return_exceptions=True,
+            )
+            for cat, result in zip(potential_categories, results):
+                if isinstance(result, Exception):
                     logger.warning(
-                        f"Failed to cleanup attachments for category '{cat}': {e}"
+                        "Failed to cleanup attachments for category '%s': %s",
+                        cat,
+                        result,
                     )
         except Exception as e:
-            logger.warning(f"Error during attachment cleanup: {e}")
+            logger.warning("Error during attachment cleanup: %s", e)
 
         return json_response
 
     async def append_content(self, note_id: int, content: str) -> Dict[str, Any]:
-        """Append content to an existing note with a separator."""
-        logger.info(f"Appending content to note {note_id}")
+        """Append content to an existing note with a separator.
+
+        If the note was seen recently, the known version is updated directly
+        without fetching it first. Should it have changed in the meantime the
+        server rejects the etag, and the append is retried on a fresh copy.
+        """
+        logger.info("Appending content to note %s", note_id)
+
+        seen = self._seen_notes.get(note_id)
+        if seen is not None:
+            try:
+                return await self._append_to(dict(seen[1]), content)
+            except HTTPStatusError as e:
+                if e.response.status_code != 412:
+                    raise
+                logger.info(
+                    "Note %s changed since it was last seen, refetching", note_id
+                )
 
         # Get current note
         current_note = await self.get_note(note_id)
+        return await self._append_to(current_note, content)
 
+    async def _append_to(
+        self, current_note: Dict[str, Any], content: str
+    ) -> Dict[str, Any]:
+        """Update `current_note` with `content` appended to its content."""
         # Use fixed separator for consistency
         separator = "\n---\n"
 
         # Combine content
         existing_content = current_note.get("content", "")
         if existing_content:
-            new_content = existing_content + separator + content
+            new_content = "".join((existing_content, separator, content))
         else:
             new_content = content  # No separator needed for empty notes
 
         logger.info(
-            f"Combining existing content ({len(existing_content)} chars) with new content ({len(content)} chars)"
+            "Combining existing content (%s chars) with new content (%s chars)",
+            len(existing_content),
+            len(content),
         )
 
         # Update with combined content
         return await self.update(
-            note_id=note_id,
+            note_id=current_note["id"],
             etag=current_note["etag"],
             content=new_content,
             title=None,  # Keep existing title
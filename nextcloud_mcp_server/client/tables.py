@@ -3,7 +3,7 @@
 import logging
 from typing import Any, Dict, List, Optional
 
-from .base import BaseNextcloudClient
+from .base import OCS_JSON_HEADERS, BaseNextcloudClient, decode_json
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +16,9 @@ class TablesClient(BaseNextcloudClient):
         response = await self._make_request(
             "GET",
             "/ocs/v2.php/apps/tables/api/2/tables",
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
         )
-        result = response.json()
+        result = decode_json(response)
         return result["ocs"]["data"]
 
     async def get_table_schema(self, table_id: int) -> Dict[str, Any]:
@@ -27,7 +27,7 @@ class TablesClient(BaseNextcloudClient):
         response = await self._make_request(
             "GET", f"/index.php/apps/tables/api/1/tables/{table_id}/scheme"
         )
-        return response.json()
+        return decode_json(response)
 
     async def get_table_rows(
         self, table_id: int, limit: Optional[int] = None, offset: Optional[int] = None
@@ -42,7 +42,7 @@ class TablesClient(BaseNextcloudClient):
         response = await self._make_request(
             "GET", f"/index.php/apps/tables/api/1/tables/{table_id}/rows", params=params
         )
-        return response.json()
+        return decode_json(response)
 
     async def create_row(self, table_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a new row into a table.
@@ -57,10 +57,10 @@ class TablesClient(BaseNextcloudClient):
         response = await self._make_request(
             "POST",
             f"/ocs/v2.php/apps/tables/api/2/tables/{table_id}/rows",
-            headers={"OCS-APIRequest": "true", "Accept": "application/json"},
+            headers=OCS_JSON_HEADERS,
             json={"data": api_data},
         )
-        result = response.json()
+        result = decode_json(response)
         return result["ocs"]["data"]
 
     async def update_row(self, row_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -78,14 +78,14 @@ class TablesClient(BaseNextcloudClient):
             f"/index.php/apps/tables/api/1/rows/{row_id}",
             json={"data": api_data},
         )
-        return response.json()
+        return decode_json(response)
 
     async def delete_row(self, row_id: int) -> Dict[str, Any]:
         """Delete a row from a table."""
         response = await self._make_request(
             "DELETE", f"/index.php/apps/tables/api/1/rows/{row_id}"
         )
-        return response.json()
+        return decode_json(response)
 
     def transform_row_data(
         self, rows: List[Dict[str, Any]], columns: List[Dict[str, Any]]
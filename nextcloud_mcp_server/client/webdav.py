@@ -1,16 +1,128 @@
 """WebDAV client for Nextcloud file operations."""
 
+import asyncio
 import logging
 import mimetypes
-import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional, Tuple
-
-from httpx import HTTPStatusError
-
-from .base import BaseNextcloudClient
+import os
+import uuid
+from contextlib import aclosing
+from pathlib import Path
+from urllib.parse import quote
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from httpx import HTTPStatusError, Response
+
+from .base import HTTP_TIMEOUTS, BaseNextcloudClient, iter_multistatus
 
 logger = logging.getLogger(__name__)
 
+# Static request headers, httpx copies them per request. WebDAV requests do
+# not need the OCS-APIRequest header, it only applies to /ocs endpoints
+_PROPFIND_DEPTH1_HEADERS = {"Depth": "1", "Content-Type": "text/xml"}
+
+# Load the system MIME type tables once at import instead of on first upload
+mimetypes.init()
+
+# Uploads larger than one chunk use Nextcloud's chunked upload (v2) API.
+# Chunks must be at least 5 MiB (except the last one) for S3 primary storage.
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+
+# Downloads written to disk are read from the response in pieces of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+# MIME types by lowercase file extension, seeded with the common attachment
+# types and filled from the mimetypes database as known extensions are seen
+_MIME_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "pdf": "application/pdf",
+    "md": "text/markdown",
+    "txt": "text/plain",
+}
+
+
+def _guess_mime_type(filename: str) -> str:
+    """Guess the MIME type of a file name, defaulting to octet-stream."""
+    extension = filename.rpartition(".")[2].lower() if "." in filename else ""
+    mime_type = _MIME_TYPES.get(extension)
+    if mime_type is None:
+        mime_type, _ = mimetypes.guess_type(f"file.{extension}")
+        if mime_type is None:
+            # Unknown extensions are not cached, they are unbounded
+            return "application/octet-stream"
+        _MIME_TYPES[extension] = mime_type
+    return mime_type
+
+
+def _attachment_dir(note_id: int, category: Optional[str] = None) -> str:
+    """Return the attachments directory of a note, relative to the WebDAV root.
+
+    The category is percent-encoded, keeping `/` between nested categories.
+    """
+    if category:
+        return f"Notes/{quote(category)}/.attachments.{note_id}"
+    return f"Notes/.attachments.{note_id}"
+
+
+def _attachment_path(
+    note_id: int, filename: str, category: Optional[str] = None
+) -> str:
+    """Return the path of a note attachment, relative to the WebDAV root.
+
+    The file name is percent-encoded, so names containing `#`, `?` or `/`
+    still address the attachment.
+    """
+    return f"{_attachment_dir(note_id, category)}/{quote(filename, safe='')}"
+
+
+async def _rechunk(
+    content: bytes | AsyncIterable[bytes] | BinaryIO, size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield `content` in pieces of `size` bytes, the last one may be shorter."""
+    if isinstance(content, (bytes, bytearray)):
+        for start in range(0, len(content), size):
+            yield bytes(content[start : start + size])
+        return
+
+    if hasattr(content, "read"):
+        # Blocking file reads happen in a worker thread
+        while chunk := await asyncio.to_thread(content.read, size):
+            yield chunk
+        return
+
+    buffer = bytearray()
+    async for piece in content:
+        buffer += piece
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _prepend(
+    chunks: List[bytes], rest: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    """Yield the already consumed `chunks` followed by the remainder of `rest`."""
+    for chunk in chunks:
+        yield chunk
+    async for chunk in rest:
+        yield chunk
+
 
 class WebDAVClient(BaseNextcloudClient):
     """Client for Nextcloud WebDAV operations."""
@@ -23,204 +135,337 @@ class WebDAVClient(BaseNextcloudClient):
         else:
             path_with_slash = path
 
-        webdav_path = f"{self._get_webdav_base_path()}/{path_with_slash.lstrip('/')}"
-        logger.debug(f"Deleting WebDAV resource: {webdav_path}")
+        webdav_path = f"{self._webdav_base}/{path_with_slash.lstrip('/')}"
+        logger.debug("Deleting WebDAV resource: %s", webdav_path)
 
-        headers = {"OCS-APIRequest": "true"}
         try:
-            # First try a PROPFIND to verify resource exists
-            propfind_headers = {"Depth": "0", "OCS-APIRequest": "true"}
-            try:
-                propfind_resp = await self._make_request(
-                    "PROPFIND", webdav_path, headers=propfind_headers
-                )
-                logger.debug(
-                    f"Resource exists check status: {propfind_resp.status_code}"
-                )
-            except HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    logger.debug(f"Resource '{path}' doesn't exist, no deletion needed")
-                    return {"status_code": 404}
-                # For other errors, continue with deletion attempt
-
-            # Proceed with deletion
-            response = await self._make_request("DELETE", webdav_path, headers=headers)
-            logger.debug(f"Successfully deleted WebDAV resource '{path}'")
+            # DELETE answers 404 for missing resources, no need to probe first
+            response = await self._make_request(
+                "DELETE", webdav_path, allow_status=(404,)
+            )
+            if response.status_code == 404:
+                logger.debug("Resource '%s' not found, no deletion needed", path)
+            else:
+                logger.debug("Successfully deleted WebDAV resource '%s'", path)
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
-            if e.response.status_code == 404:
-                logger.debug(f"Resource '{path}' not found, no deletion needed")
-                return {"status_code": 404}
-            else:
-                logger.error(f"HTTP error deleting WebDAV resource '{path}': {e}")
-                raise e
+            logger.error("HTTP error deleting WebDAV resource '%s': %s", path, e)
+            raise e
         except Exception as e:
-            logger.error(f"Unexpected error deleting WebDAV resource '{path}': {e}")
+            logger.error("Unexpected error deleting WebDAV resource '%s': %s", path, e)
             raise e
 
     async def cleanup_old_attachment_directory(
         self, note_id: int, old_category: str
     ) -> Dict[str, Any]:
         """Clean up the attachment directory for a note in its old category location."""
-        old_category_path_part = f"{old_category}/" if old_category else ""
-        old_attachment_dir_path = (
-            f"Notes/{old_category_path_part}.attachments.{note_id}/"
-        )
+        old_attachment_dir_path = f"{_attachment_dir(note_id, old_category)}/"
 
-        logger.debug(f"Cleaning up old attachment directory: {old_attachment_dir_path}")
+        logger.debug(
+            "Cleaning up old attachment directory: %s", old_attachment_dir_path
+        )
         try:
             delete_result = await self.delete_resource(path=old_attachment_dir_path)
-            logger.debug(f"Cleanup result: {delete_result}")
+            logger.debug("Cleanup result: %s", delete_result)
             return delete_result
         except Exception as e:
-            logger.error(f"Error during cleanup of old attachment directory: {e}")
+            logger.error("Error during cleanup of old attachment directory: %s", e)
             raise e
 
     async def cleanup_note_attachments(
         self, note_id: int, category: str
     ) -> Dict[str, Any]:
         """Clean up attachment directory for a specific note and category."""
-        cat_path_part = f"{category}/" if category else ""
-        attachment_dir_path = f"Notes/{cat_path_part}.attachments.{note_id}/"
+        attachment_dir_path = f"{_attachment_dir(note_id, category)}/"
 
         logger.debug(
-            f"Cleaning up attachments for note {note_id} in category '{category}'"
+            "Cleaning up attachments for note %s in category '%s'", note_id, category
         )
         try:
             delete_result = await self.delete_resource(path=attachment_dir_path)
-            logger.debug(f"Cleanup result for note {note_id}: {delete_result}")
+            logger.debug("Cleanup result for note %s: %s", note_id, delete_result)
             return delete_result
         except Exception as e:
-            logger.error(f"Failed cleaning up attachments for note {note_id}: {e}")
+            logger.error("Failed cleaning up attachments for note %s: %s", note_id, e)
             raise e
 
+    async def _ensure_directory(self, path: str) -> None:
+        """Create a directory via MKCOL, it is fine if it already exists."""
+        try:
+            # 405 Method Not Allowed: the directory already exists
+            await self._make_request("MKCOL", path, allow_status=(405,))
+        except HTTPStatusError as e:
+            logger.error(
+                "Unexpected status code %s when creating directory '%s'",
+                e.response.status_code,
+                path,
+            )
+            raise
+
+    async def _with_parent_directory(
+        self, parent_dir_path: str, request: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        """Send `request`, creating `parent_dir_path` and retrying once if the
+        server answers 409 Conflict because the parent is missing."""
+        try:
+            return await request()
+        except HTTPStatusError as e:
+            if e.response.status_code != 409:
+                raise
+        logger.debug("Parent directory missing, creating '%s'", parent_dir_path)
+        await self._ensure_directory(parent_dir_path)
+        return await request()
+
+    async def _chunked_upload(
+        self,
+        destination_path: str,
+        chunks: AsyncIterator[bytes],
+        parent_dir_path: Optional[str] = None,
+    ) -> Response:
+        """Upload `chunks` to `destination_path` using the chunked upload v2 API.
+
+        The chunks are stored in a temporary upload collection which is then
+        assembled server-side by moving its `.file` onto the destination. If
+        `parent_dir_path` is given it is created when the move reports it
+        missing.
+        """
+        upload_path = f"/remote.php/dav/uploads/{self.username}/{uuid.uuid4().hex}"
+        headers = {"Destination": destination_path}
+
+        await self._make_request("MKCOL", upload_path, headers=headers)
+        try:
+            index = 0
+            async for chunk in chunks:
+                index += 1
+                await self._make_request(
+                    "PUT",
+                    f"{upload_path}/{index:05d}",
+                    content=chunk,
+                    headers=headers,
+                    timeout=HTTP_TIMEOUTS["transfer"],
+                )
+            logger.debug("Uploaded %s chunks, assembling '%s'", index, destination_path)
+
+            # Assembling the chunks may take a while for large files
+            def assemble():
+                return self._make_request(
+                    "MOVE",
+                    f"{upload_path}/.file",
+                    headers=headers,
+                    timeout=HTTP_TIMEOUTS["transfer"],
+                )
+
+            if parent_dir_path:
+                return await self._with_parent_directory(parent_dir_path, assemble)
+            return await assemble()
+        except Exception:
+            # Don't leave the partial upload behind on the server
+            try:
+                await self._make_request("DELETE", upload_path)
+            except Exception as e:
+                logger.warning(
+                    "Failed to remove chunked upload '%s': %s", upload_path, e
+                )
+            raise
+
+    async def _download(self, path: str, destination: Path) -> str:
+        """Stream the body of a GET on `path` into `destination`, returning
+        its content type.
+
+        The body is written to a temporary file next to `destination`, which
+        replaces it only once the download is complete, so a failed or
+        cancelled download never leaves a truncated file behind.
+        """
+        async with self._client.stream(
+            "GET", path, timeout=HTTP_TIMEOUTS["transfer"]
+        ) as response:
+            response.raise_for_status()
+            partial = destination.with_name(
+                f".{destination.name}.{uuid.uuid4().hex}.part"
+            )
+            file = await asyncio.to_thread(open, partial, "wb")
+            try:
+                try:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await asyncio.to_thread(file.write, chunk)
+                finally:
+                    await asyncio.to_thread(file.close)
+                await asyncio.to_thread(os.replace, partial, destination)
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+            return response.headers.get("content-type", "application/octet-stream")
+
     async def add_note_attachment(
         self,
         note_id: int,
         filename: str,
-        content: bytes,
+        content: bytes | AsyncIterable[bytes] | BinaryIO,
         category: Optional[str] = None,
         mime_type: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Add/Update an attachment to a note via WebDAV PUT."""
+        """Add/Update an attachment to a note via WebDAV PUT.
+
+        `content` may be raw bytes, an async iterable of bytes or a binary file
+        object, the latter two are consumed incrementally. Attachments larger
+        than `UPLOAD_CHUNK_SIZE` are uploaded with the chunked upload API so
+        they are never held in memory as a whole.
+        """
         # Construct paths based on provided category
-        webdav_base = self._get_webdav_base_path()
-        category_path_part = f"{category}/" if category else ""
-        attachment_dir_segment = f".attachments.{note_id}"
-        parent_dir_webdav_rel_path = (
-            f"Notes/{category_path_part}{attachment_dir_segment}"
-        )
+        webdav_base = self._webdav_base
+        parent_dir_webdav_rel_path = _attachment_dir(note_id, category)
         parent_dir_path = f"{webdav_base}/{parent_dir_webdav_rel_path}"
-        attachment_path = f"{parent_dir_path}/{filename}"
+        attachment_path = (
+            f"{webdav_base}/{_attachment_path(note_id, filename, category)}"
+        )
 
-        logger.debug(f"Uploading attachment '{filename}' for note {note_id}")
+        logger.debug("Uploading attachment '%s' for note %s", filename, note_id)
 
         if not mime_type:
-            mime_type, _ = mimetypes.guess_type(filename)
-            if not mime_type:
-                mime_type = "application/octet-stream"
+            mime_type = _guess_mime_type(filename)
 
-        headers = {"Content-Type": mime_type, "OCS-APIRequest": "true"}
+        headers = {"Content-Type": mime_type}
         try:
-            # First check if we can access WebDAV at all
-            notes_dir_path = f"{webdav_base}/Notes"
-            propfind_headers = {"Depth": "0", "OCS-APIRequest": "true"}
-            notes_dir_response = await self._make_request(
-                "PROPFIND", notes_dir_path, headers=propfind_headers
-            )
-
-            if notes_dir_response.status_code == 401:
-                logger.error("WebDAV authentication failed for Notes directory")
-                raise HTTPStatusError(
-                    f"Authentication error accessing WebDAV Notes directory: {notes_dir_response.status_code}",
-                    request=notes_dir_response.request,
-                    response=notes_dir_response,
-                )
-            elif notes_dir_response.status_code >= 400:
-                logger.error(
-                    f"Error accessing WebDAV Notes directory: {notes_dir_response.status_code}"
+            # Read ahead two chunks to decide between a single PUT and a
+            # chunked upload
+            chunks = _rechunk(content)
+            head = []
+            async for chunk in chunks:
+                head.append(chunk)
+                if len(head) == 2:
+                    break
+            # The attachments directory usually exists already, so upload
+            # right away and only create it when the server reports 409
+            if len(head) > 1:
+                response = await self._chunked_upload(
+                    attachment_path, _prepend(head, chunks), parent_dir_path
                 )
-                notes_dir_response.raise_for_status()
-
-            # Ensure the parent directory exists using MKCOL
-            mkcol_headers = {"OCS-APIRequest": "true"}
-            mkcol_response = await self._make_request(
-                "MKCOL", parent_dir_path, headers=mkcol_headers
-            )
-
-            # MKCOL should return 201 Created or 405 Method Not Allowed (if directory already exists)
-            if mkcol_response.status_code not in [201, 405]:
-                logger.error(
-                    f"Unexpected status code {mkcol_response.status_code} when creating attachments directory"
+            else:
+                response = await self._with_parent_directory(
+                    parent_dir_path,
+                    lambda: self._make_request(
+                        "PUT",
+                        attachment_path,
+                        content=head[0] if head else b"",
+                        headers=headers,
+                        timeout=HTTP_TIMEOUTS["transfer"],
+                    ),
                 )
-                mkcol_response.raise_for_status()
-
-            # Proceed with the PUT request
-            response = await self._make_request(
-                "PUT", attachment_path, content=content, headers=headers
-            )
-            response.raise_for_status()
             logger.debug(
-                f"Successfully uploaded attachment '{filename}' to note {note_id}"
+                "Successfully uploaded attachment '%s' to note %s", filename, note_id
             )
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
             logger.error(
-                f"HTTP error uploading attachment '{filename}' to note {note_id}: {e}"
+                "HTTP error uploading attachment '%s' to note %s: %s",
+                filename,
+                note_id,
+                e,
             )
             raise e
         except Exception as e:
             logger.error(
-                f"Unexpected error uploading attachment '{filename}' to note {note_id}: {e}"
+                "Unexpected error uploading attachment '%s' to note %s: %s",
+                filename,
+                note_id,
+                e,
             )
             raise e
 
+    async def iter_note_attachment(
+        self,
+        note_id: int,
+        filename: str,
+        category: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the content of a note attachment in chunks of at most
+        `DOWNLOAD_CHUNK_SIZE` bytes as it is received.
+
+        The response is closed once the iterator is exhausted or closed.
+        """
+        attachment_path = (
+            f"{self._webdav_base}/{_attachment_path(note_id, filename, category)}"
+        )
+        logger.debug("Streaming attachment '%s' for note %s", filename, note_id)
+        async with self._client.stream(
+            "GET", attachment_path, timeout=HTTP_TIMEOUTS["transfer"]
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+
     async def get_note_attachment(
-        self, note_id: int, filename: str, category: Optional[str] = None
+        self,
+        note_id: int,
+        filename: str,
+        category: Optional[str] = None,
+        stream_to: Optional[Path] = None,
     ) -> Tuple[bytes, str]:
-        """Fetch a specific attachment from a note via WebDAV GET."""
-        webdav_base = self._get_webdav_base_path()
-        category_path_part = f"{category}/" if category else ""
-        attachment_dir_segment = f".attachments.{note_id}"
-        attachment_path = f"{webdav_base}/Notes/{category_path_part}{attachment_dir_segment}/{filename}"
+        """Fetch a specific attachment from a note via WebDAV GET.
+
+        With `stream_to`, the attachment is written to that file as it is
+        received instead of being held in memory, and the returned content is
+        empty.
+        """
+        webdav_base = self._webdav_base
+        attachment_path = (
+            f"{webdav_base}/{_attachment_path(note_id, filename, category)}"
+        )
 
-        logger.debug(f"Fetching attachment '{filename}' for note {note_id}")
+        logger.debug("Fetching attachment '%s' for note %s", filename, note_id)
 
         try:
-            response = await self._make_request("GET", attachment_path)
+            if stream_to is not None:
+                mime_type = await self._download(attachment_path, stream_to)
+                logger.debug(
+                    "Successfully saved attachment '%s' to %s", filename, stream_to
+                )
+                return b"", mime_type
+
+            response = await self._make_request(
+                "GET", attachment_path, timeout=HTTP_TIMEOUTS["transfer"]
+            )
             response.raise_for_status()
 
             content = response.content
             mime_type = response.headers.get("content-type", "application/octet-stream")
 
             logger.debug(
-                f"Successfully fetched attachment '{filename}' ({len(content)} bytes)"
+                "Successfully fetched attachment '%s' (%s bytes)",
+                filename,
+                len(content),
             )
             return content, mime_type
 
         except HTTPStatusError as e:
             if e.response.status_code == 404:
-                logger.debug(f"Attachment '{filename}' not found for note {note_id}")
+                logger.debug("Attachment '%s' not found for note %s", filename, note_id)
             else:
                 logger.error(
-                    f"HTTP error fetching attachment '{filename}' for note {note_id}: {e}"
+                    "HTTP error fetching attachment '%s' for note %s: %s",
+                    filename,
+                    note_id,
+                    e,
                 )
             raise e
         except Exception as e:
             logger.error(
-                f"Unexpected error fetching attachment '{filename}' for note {note_id}: {e}"
+                "Unexpected error fetching attachment '%s' for note %s: %s",
+                filename,
+                note_id,
+                e,
             )
             raise e
 
     async def list_directory(self, path: str = "") -> List[Dict[str, Any]]:
         """List files and directories in the specified path via WebDAV PROPFIND."""
-        webdav_path = f"{self._get_webdav_base_path()}/{path.lstrip('/')}"
+        webdav_path = f"{self._webdav_base}/{path.lstrip('/')}"
         if not webdav_path.endswith("/"):
             webdav_path += "/"
 
-        logger.debug(f"Listing directory: {path}")
+        logger.debug("Listing directory: %s", path)
 
         propfind_body = """<?xml version="1.0"?>
         <d:propfind xmlns:d="DAV:">
@@ -233,93 +478,103 @@ class WebDAVClient(BaseNextcloudClient):
             </d:prop>
         </d:propfind>"""
 
-        headers = {"Depth": "1", "Content-Type": "text/xml", "OCS-APIRequest": "true"}
+        headers = _PROPFIND_DEPTH1_HEADERS
 
         try:
             response = await self._make_request(
-                "PROPFIND", webdav_path, content=propfind_body, headers=headers
+                "PROPFIND",
+                webdav_path,
+                content=propfind_body,
+                headers=headers,
+                stream=True,
             )
-            response.raise_for_status()
 
-            # Parse the XML response
-            root = ET.fromstring(response.content)
+            # Parse the XML response as it arrives
             items = []
+            is_first = True
+
+            async with aclosing(iter_multistatus(response)) as responses:
+                async for response_elem in responses:
+                    # Skip the first response (the directory itself)
+                    if is_first:
+                        is_first = False
+                        continue
+
+                    href = response_elem.find(".//{DAV:}href")
+                    if href is None:
+                        continue
+
+                    # Extract file/directory name from href
+                    href_text = href.text or ""
+                    name = href_text.rstrip("/").split("/")[-1]
+                    if not name:
+                        continue
+
+                    # Get properties
+                    propstat = response_elem.find(".//{DAV:}propstat")
+                    if propstat is None:
+                        continue
+
+                    prop = propstat.find(".//{DAV:}prop")
+                    if prop is None:
+                        continue
+
+                    # Determine if it's a directory
+                    resourcetype = prop.find(".//{DAV:}resourcetype")
+                    is_directory = (
+                        resourcetype is not None
+                        and resourcetype.find(".//{DAV:}collection") is not None
+                    )
 
-            # Skip the first response (the directory itself)
-            responses = root.findall(".//{DAV:}response")[1:]
-
-            for response_elem in responses:
-                href = response_elem.find(".//{DAV:}href")
-                if href is None:
-                    continue
-
-                # Extract file/directory name from href
-                href_text = href.text or ""
-                name = href_text.rstrip("/").split("/")[-1]
-                if not name:
-                    continue
-
-                # Get properties
-                propstat = response_elem.find(".//{DAV:}propstat")
-                if propstat is None:
-                    continue
-
-                prop = propstat.find(".//{DAV:}prop")
-                if prop is None:
-                    continue
-
-                # Determine if it's a directory
-                resourcetype = prop.find(".//{DAV:}resourcetype")
-                is_directory = (
-                    resourcetype is not None
-                    and resourcetype.find(".//{DAV:}collection") is not None
-                )
-
-                # Get other properties
-                size_elem = prop.find(".//{DAV:}getcontentlength")
-                size = (
-                    int(size_elem.text)
-                    if size_elem is not None and size_elem.text
-                    else 0
-                )
+                    # Get other properties
+                    size_elem = prop.find(".//{DAV:}getcontentlength")
+                    size = (
+                        int(size_elem.text)
+                        if size_elem is not None and size_elem.text
+                        else 0
+                    )
 
-                content_type_elem = prop.find(".//{DAV:}getcontenttype")
-                content_type = (
-                    content_type_elem.text if content_type_elem is not None else None
-                )
+                    content_type_elem = prop.find(".//{DAV:}getcontenttype")
+                    content_type = (
+                        content_type_elem.text
+                        if content_type_elem is not None
+                        else None
+                    )
 
-                modified_elem = prop.find(".//{DAV:}getlastmodified")
-                modified = modified_elem.text if modified_elem is not None else None
-
-                items.append(
-                    {
-                        "name": name,
-                        "path": f"{path.rstrip('/')}/{name}" if path else name,
-                        "is_directory": is_directory,
-                        "size": size if not is_directory else None,
-                        "content_type": content_type,
-                        "last_modified": modified,
-                    }
-                )
+                    modified_elem = prop.find(".//{DAV:}getlastmodified")
+                    modified = modified_elem.text if modified_elem is not None else None
+
+                    items.append(
+                        {
+                            "name": name,
+                            "path": f"{path.rstrip('/')}/{name}" if path else name,
+                            "is_directory": is_directory,
+                            "size": size if not is_directory else None,
+                            "content_type": content_type,
+                            "last_modified": modified,
+                        }
+                    )
 
-            logger.debug(f"Found {len(items)} items in directory: {path}")
+            logger.debug("Found %s items in directory: %s", len(items), path)
             return items
 
         except HTTPStatusError as e:
-            logger.error(f"HTTP error listing directory '{webdav_path}': {e}")
+            logger.error("HTTP error listing directory '%s': %s", webdav_path, e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error listing directory '{webdav_path}': {e}")
+            logger.error("Unexpected error listing directory '%s': %s", webdav_path, e)
             raise e
 
     async def read_file(self, path: str) -> Tuple[bytes, str]:
         """Read a file's content via WebDAV GET."""
-        webdav_path = f"{self._get_webdav_base_path()}/{path.lstrip('/')}"
+        webdav_path = f"{self._webdav_base}/{path.lstrip('/')}"
 
-        logger.debug(f"Reading file: {path}")
+        logger.debug("Reading file: %s", path)
 
         try:
-            response = await self._make_request("GET", webdav_path)
+            response = await self._make_request(
+                "GET", webdav_path, timeout=HTTP_TIMEOUTS["transfer"]
+            )
             response.raise_for_status()
 
             content = response.content
@@ -327,70 +582,70 @@ class WebDAVClient(BaseNextcloudClient):
                 "content-type", "application/octet-stream"
             )
 
-            logger.debug(f"Successfully read file '{path}' ({len(content)} bytes)")
+            logger.debug("Successfully read file '%s' (%s bytes)", path, len(content))
             return content, content_type
 
         except HTTPStatusError as e:
-            logger.error(f"HTTP error reading file '{path}': {e}")
+            logger.error("HTTP error reading file '%s': %s", path, e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error reading file '{path}': {e}")
+            logger.error("Unexpected error reading file '%s': %s", path, e)
             raise e
 
     async def write_file(
         self, path: str, content: bytes, content_type: Optional[str] = None
     ) -> Dict[str, Any]:
         """Write content to a file via WebDAV PUT."""
-        webdav_path = f"{self._get_webdav_base_path()}/{path.lstrip('/')}"
+        webdav_path = f"{self._webdav_base}/{path.lstrip('/')}"
 
-        logger.debug(f"Writing file: {path}")
+        logger.debug("Writing file: %s", path)
 
         if not content_type:
-            content_type, _ = mimetypes.guess_type(path)
-            if not content_type:
-                content_type = "application/octet-stream"
+            content_type = _guess_mime_type(path.rsplit("/", 1)[-1])
 
-        headers = {"Content-Type": content_type, "OCS-APIRequest": "true"}
+        headers = {"Content-Type": content_type}
 
         try:
             response = await self._make_request(
-                "PUT", webdav_path, content=content, headers=headers
+                "PUT",
+                webdav_path,
+                content=content,
+                headers=headers,
+                timeout=HTTP_TIMEOUTS["transfer"],
             )
             response.raise_for_status()
 
-            logger.debug(f"Successfully wrote file '{path}'")
+            logger.debug("Successfully wrote file '%s'", path)
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
-            logger.error(f"HTTP error writing file '{path}': {e}")
+            logger.error("HTTP error writing file '%s': %s", path, e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error writing file '{path}': {e}")
+            logger.error("Unexpected error writing file '%s': %s", path, e)
             raise e
 
     async def create_directory(
         self, path: str, recursive: bool = False
     ) -> Dict[str, Any]:
         """Create a directory via WebDAV MKCOL."""
-        webdav_path = f"{self._get_webdav_base_path()}/{path.lstrip('/')}"
+        webdav_path = f"{self._webdav_base}/{path.lstrip('/')}"
         if not webdav_path.endswith("/"):
             webdav_path += "/"
 
-        logger.debug(f"Creating directory: {path}")
-
-        headers = {"OCS-APIRequest": "true"}
+        logger.debug("Creating directory: %s", path)
 
         try:
-            response = await self._make_request("MKCOL", webdav_path, headers=headers)
+            response = await self._make_request("MKCOL", webdav_path)
             response.raise_for_status()
 
-            logger.debug(f"Successfully created directory '{path}'")
+            logger.debug("Successfully created directory '%s'", path)
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
             # Method Not Allowed - directory already exists
             if e.response.status_code == 405:
-                logger.debug(f"Directory '{path}' already exists")
+                logger.debug("Directory '%s' already exists", path)
                 return {"status_code": 405, "message": "Directory already exists"}
 
             # File Conflict - parent directory does not exist
@@ -400,20 +655,21 @@ class WebDAVClient(BaseNextcloudClient):
                 if len(path_parts) > 1:
                     parent_dir = "/".join(path_parts[:-1])
                     logger.debug(
-                        f"Parent directory '{parent_dir}' doesn't exist, creating recursively"
+                        "Parent directory '%s' doesn't exist, creating recursively",
+                        parent_dir,
                     )
                     await self.create_directory(parent_dir, recursive)
                     # Now try to create the original directory again
                     return await self.create_directory(path, recursive)
                 else:
                     # This shouldn't happen for single-level directories under root
-                    logger.error(f"409 conflict for single-level directory '{path}'")
+                    logger.error("409 conflict for single-level directory '%s'", path)
                     raise e
 
-            logger.error(f"HTTP error creating directory '{path}': {e}")
+            logger.error("HTTP error creating directory '%s': %s", path, e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error creating directory '{path}': {e}")
+            logger.error("Unexpected error creating directory '%s': %s", path, e)
             raise e
 
     async def move_resource(
@@ -429,10 +685,8 @@ class WebDAVClient(BaseNextcloudClient):
         Returns:
             Dict with status_code and optional message
         """
-        source_webdav_path = f"{self._get_webdav_base_path()}/{source_path.lstrip('/')}"
-        destination_webdav_path = (
-            f"{self._get_webdav_base_path()}/{destination_path.lstrip('/')}"
-        )
+        source_webdav_path = f"{self._webdav_base}/{source_path.lstrip('/')}"
+        destination_webdav_path = f"{self._webdav_base}/{destination_path.lstrip('/')}"
 
         # Ensure paths have consistent trailing slashes for directories
         if source_path.endswith("/") and not destination_path.endswith("/"):
@@ -440,10 +694,9 @@ class WebDAVClient(BaseNextcloudClient):
         elif not source_path.endswith("/") and destination_path.endswith("/"):
             source_webdav_path += "/"
 
-        logger.debug(f"Moving resource from '{source_path}' to '{destination_path}'")
+        logger.debug("Moving resource from '%s' to '%s'", source_path, destination_path)
 
         headers = {
-            "OCS-APIRequest": "true",
             "Destination": destination_webdav_path,
             "Overwrite": "T" if overwrite else "F",
         }
@@ -455,17 +708,20 @@ class WebDAVClient(BaseNextcloudClient):
             response.raise_for_status()
 
             logger.debug(
-                f"Successfully moved resource from '{source_path}' to '{destination_path}'"
+                "Successfully moved resource from '%s' to '%s'",
+                source_path,
+                destination_path,
             )
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
             if e.response.status_code == 404:
-                logger.debug(f"Source resource '{source_path}' not found")
+                logger.debug("Source resource '%s' not found", source_path)
                 return {"status_code": 404, "message": "Source resource not found"}
             elif e.response.status_code == 412:
                 logger.debug(
-                    f"Destination '{destination_path}' already exists and overwrite is false"
+                    "Destination '%s' already exists and overwrite is false",
+                    destination_path,
                 )
                 return {
                     "status_code": 412,
@@ -473,14 +729,16 @@ class WebDAVClient(BaseNextcloudClient):
                 }
             elif e.response.status_code == 409:
                 logger.debug(
-                    f"Parent directory of destination '{destination_path}' doesn't exist"
+                    "Parent directory of destination '%s' doesn't exist",
+                    destination_path,
                 )
                 return {
                     "status_code": 409,
                     "message": "Parent directory of destination doesn't exist",
                 }
                 logger.debug(
-                    f"Parent directory of destination '{destination_path}' doesn't exist"
+                    "Parent directory of destination '%s' doesn't exist",
+                    destination_path,
                 )
                 return {
                     "status_code": 409,
@@ -488,12 +746,18 @@ class WebDAVClient(BaseNextcloudClient):
                 }
             else:
                 logger.error(
-                    f"HTTP error moving resource from '{source_path}' to '{destination_path}': {e}"
+                    "HTTP error moving resource from '%s' to '%s': %s",
+                    source_path,
+                    destination_path,
+                    e,
                 )
                 raise e
         except Exception as e:
             logger.error(
-                f"Unexpected error moving resource from '{source_path}' to '{destination_path}': {e}"
+                "Unexpected error moving resource from '%s' to '%s': %s",
+                source_path,
+                destination_path,
+                e,
             )
             raise e
 
@@ -510,10 +774,8 @@ class WebDAVClient(BaseNextcloudClient):
         Returns:
             Dict with status_code and optional message
         """
-        source_webdav_path = f"{self._get_webdav_base_path()}/{source_path.lstrip('/')}"
-        destination_webdav_path = (
-            f"{self._get_webdav_base_path()}/{destination_path.lstrip('/')}"
-        )
+        source_webdav_path = f"{self._webdav_base}/{source_path.lstrip('/')}"
+        destination_webdav_path = f"{self._webdav_base}/{destination_path.lstrip('/')}"
 
         # Ensure paths have consistent trailing slashes for directories
         if source_path.endswith("/") and not destination_path.endswith("/"):
@@ -521,10 +783,11 @@ class WebDAVClient(BaseNextcloudClient):
         elif not source_path.endswith("/") and destination_path.endswith("/"):
             source_webdav_path += "/"
 
-        logger.debug(f"Copying resource from '{source_path}' to '{destination_path}'")
+        logger.debug(
+            "Copying resource from '%s' to '%s'", source_path, destination_path
+        )
 
         headers = {
-            "OCS-APIRequest": "true",
             "Destination": destination_webdav_path,
             "Overwrite": "T" if overwrite else "F",
         }
@@ -536,17 +799,20 @@ class WebDAVClient(BaseNextcloudClient):
             response.raise_for_status()
 
             logger.debug(
-                f"Successfully copied resource from '{source_path}' to '{destination_path}'"
+                "Successfully copied resource from '%s' to '%s'",
+                source_path,
+                destination_path,
             )
             return {"status_code": response.status_code}
 
         except HTTPStatusError as e:
             if e.response.status_code == 404:
-                logger.debug(f"Source resource '{source_path}' not found")
+                logger.debug("Source resource '%s' not found", source_path)
                 return {"status_code": 404, "message": "Source resource not found"}
             elif e.response.status_code == 412:
                 logger.debug(
-                    f"Destination '{destination_path}' already exists and overwrite is false"
+                    "Destination '%s' already exists and overwrite is false",
+                    destination_path,
                 )
                 return {
                     "status_code": 412,
@@ -554,7 +820,8 @@ class WebDAVClient(BaseNextcloudClient):
                 }
             elif e.response.status_code == 409:
                 logger.debug(
-                    f"Parent directory of destination '{destination_path}' doesn't exist"
+                    "Parent directory of destination '%s' doesn't exist",
+                    destination_path,
                 )
                 return {
                     "status_code": 409,
@@ -562,11 +829,17 @@ class WebDAVClient(BaseNextcloudClient):
                 }
             else:
                 logger.error(
-                    f"HTTP error copying resource from '{source_path}' to '{destination_path}': {e}"
+                    "HTTP error copying resource from '%s' to '%s': %s",
+                    source_path,
+                    destination_path,
+                    e,
                 )
                 raise e
         except Exception as e:
             logger.error(
-                f"Unexpected error copying resource from '{source_path}' to '{destination_path}': {e}"
+                "Unexpected error copying resource from '%s' to '%s': %s",
+                source_path,
+                destination_path,
+                e,
             )
             raise e
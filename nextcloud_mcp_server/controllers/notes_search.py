@@ -1,32 +1,81 @@
 """Controller for notes search functionality."""
 
-from typing import Any, Dict, List
+import heapq
+import re
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tokens are runs of at least two Unicode letters or digits, so punctuation
+# next to a word ("apples," or "(draft)") does not prevent a match
+_TOKEN_RE = re.compile(r"[^\W_]{2,}")
+
+
+@lru_cache(maxsize=1024)
+def _query_tokens(query: str) -> frozenset:
+    return frozenset(_TOKEN_RE.findall(query.casefold()))
 
 
 class NotesSearchController:
-    """Handles notes search logic and scoring."""
+    """Handles notes search logic and scoring.
+
+    Each note is tokenized once per etag into sets of title and content
+    tokens, which feed an inverted index (token -> note ids). When notes
+    change, only those notes are re-tokenized and their postings replaced,
+    and a query only touches the notes that contain one of its tokens.
+
+    Because tokens are cached per etag, notes whose etag did not change can
+    be passed without their `content` (see `uncached_note_ids`).
+    """
+
+    # Constants for weighting
+    TITLE_WEIGHT = 3.0
+    CONTENT_WEIGHT = 1.0
+
+    def __init__(self):
+        self._index_key: Optional[frozenset] = None
+        # note id -> (etag, title tokens, content tokens)
+        self._note_tokens: Dict[Any, Tuple[str, frozenset, frozenset]] = {}
+        self._title_index: Dict[str, set] = {}
+        self._content_index: Dict[str, set] = {}
+        # Notes of the last listing by id, and their position in it
+        self._indexed_notes: Dict[Any, Dict[str, Any]] = {}
+        self._positions: Dict[Any, int] = {}
 
     def search_notes(
-        self, notes: List[Dict[str, Any]], query: str
+        self, notes: List[Dict[str, Any]], query: str, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search notes using token-based matching with relevance ranking.
-        Returns notes sorted by relevance score.
+        Returns notes sorted by relevance score, at most `limit` of them.
         """
-        search_results = []
         query_tokens = self._process_query(query)
 
         # If empty query after processing, return empty results
         if not query_tokens:
             return []
 
-        # Process and score each note
-        for note in notes:
-            title_tokens, content_tokens = self._process_note_content(note)
-            score = self._calculate_score(query_tokens, title_tokens, content_tokens)
+        self._ensure_index(notes)
+
+        # Only notes containing at least one query token are scored, by
+        # intersecting their token sets with the query's
+        candidates = set()
+        for token in query_tokens:
+            candidates.update(self._title_index.get(token, ()))
+            candidates.update(self._content_index.get(token, ()))
+
+        search_results = []
+        for note_id in sorted(candidates, key=self._positions.__getitem__):
+            _, title_tokens, content_tokens = self._note_tokens[note_id]
+            score = self._calculate_score(
+                len(query_tokens),
+                len(query_tokens & title_tokens),
+                len(query_tokens & content_tokens),
+            )
 
             # Only include notes with a non-zero score
             if score >= 0.5:
+                note = self._indexed_notes[note_id]
                 search_results.append(
                     {
                         "id": note.get("id"),
@@ -37,66 +86,115 @@ class NotesSearchController:
                     }
                 )
 
-        # Sort by score in descending order
-        search_results.sort(key=lambda x: x["_score"], reverse=True)
+        # Sort by score in descending order, only the top `limit` if given
+        if limit is not None:
+            return heapq.nlargest(limit, search_results, key=itemgetter("_score"))
+        search_results.sort(key=itemgetter("_score"), reverse=True)
 
         return search_results
 
-    def _process_query(self, query: str) -> List[str]:
+    def uncached_note_ids(self, notes: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Return the ids of notes whose tokens are not cached for their etag,
+        i.e. the notes that must be passed with their content.
+        """
+        uncached = []
+        for note in notes:
+            cached = self._note_tokens.get(note.get("id"))
+            if not note.get("etag") or cached is None or cached[0] != note["etag"]:
+                uncached.append(note.get("id"))
+        return uncached
+
+    def _ensure_index(self, notes: List[Dict[str, Any]]) -> None:
+        """
+        Bring the inverted index in line with these notes, re-tokenizing only
+        notes that are new or whose etag changed.
+        """
+        if all(note.get("etag") for note in notes):
+            index_key = frozenset((note.get("id"), note["etag"]) for note in notes)
+        else:
+            # Without etags there is no way to tell whether content changed
+            index_key = None
+
+        if index_key is not None and index_key == self._index_key:
+            return
+
+        self._indexed_notes = {note.get("id"): note for note in notes}
+        self._positions = {note.get("id"): pos for pos, note in enumerate(notes)}
+
+        # Drop notes that no longer exist
+        for note_id in self._note_tokens.keys() - self._indexed_notes.keys():
+            self._remove_postings(note_id)
+
+        for note_id, note in self._indexed_notes.items():
+            etag = note.get("etag")
+            cached = self._note_tokens.get(note_id)
+            if cached is not None and etag and cached[0] == etag:
+                continue
+            if cached is not None:
+                self._remove_postings(note_id)
+
+            title_tokens, content_tokens = self._process_note_content(note)
+            self._note_tokens[note_id] = (etag, title_tokens, content_tokens)
+            for token in title_tokens:
+                self._title_index.setdefault(token, set()).add(note_id)
+            for token in content_tokens:
+                self._content_index.setdefault(token, set()).add(note_id)
+
+        self._index_key = index_key
+
+    def _remove_postings(self, note_id: Any) -> None:
+        """Remove a note from the token cache and the inverted index."""
+        _, title_tokens, content_tokens = self._note_tokens.pop(note_id)
+        for index, tokens in (
+            (self._title_index, title_tokens),
+            (self._content_index, content_tokens),
+        ):
+            for token in tokens:
+                postings = index[token]
+                postings.discard(note_id)
+                if not postings:
+                    del index[token]
+
+    def _process_query(self, query: str) -> frozenset:
         """
-        Tokenize and normalize the search query.
+        Tokenize and normalize the search query into a set of tokens.
         """
-        # Convert to lowercase and split into tokens
-        tokens = query.lower().split()
-        # Filter out very short tokens
-        tokens = [token for token in tokens if len(token) > 1]
-        return tokens
+        # Very short tokens are already dropped by the tokenizer, and repeated
+        # queries are served from a cache
+        return _query_tokens(query)
 
     def _process_note_content(
         self, note: Dict[str, Any]
-    ) -> tuple[List[str], List[str]]:
+    ) -> tuple[frozenset, frozenset]:
         """
-        Tokenize and normalize note title and content.
+        Tokenize and normalize note title and content into sets of tokens.
         """
         # Process title
-        title = note.get("title", "").lower()
-        title_tokens = title.split()
+        title_tokens = frozenset(_TOKEN_RE.findall(note.get("title", "").casefold()))
 
         # Process content
-        content = note.get("content", "").lower()
-        content_tokens = content.split()
+        content_tokens = frozenset(
+            _TOKEN_RE.findall(note.get("content", "").casefold())
+        )
 
         return title_tokens, content_tokens
 
     def _calculate_score(
         self,
-        query_tokens: List[str],
-        title_tokens: List[str],
-        content_tokens: List[str],
+        query_token_count: int,
+        title_matches: int,
+        content_matches: int,
     ) -> float:
         """
-        Calculate a relevance score for a note based on query tokens.
+        Calculate a relevance score for a note from the number of query tokens
+        found in its title and content.
         """
-        # Constants for weighting
-        TITLE_WEIGHT = 3.0
-        CONTENT_WEIGHT = 1.0
-
-        score = 0.0
-
-        # Count matches in title
-        title_matches = sum(1 for qt in query_tokens if qt in title_tokens)
-        if query_tokens:  # Avoid division by zero
-            title_match_ratio = title_matches / len(query_tokens)
-            score += TITLE_WEIGHT * title_match_ratio
-
-        # Count matches in content
-        content_matches = sum(1 for qt in query_tokens if qt in content_tokens)
-        if query_tokens:  # Avoid division by zero
-            content_match_ratio = content_matches / len(query_tokens)
-            score += CONTENT_WEIGHT * content_match_ratio
-
         # If no tokens matched at all, return zero
         if title_matches == 0 and content_matches == 0:
             return 0.0
 
+        score = self.TITLE_WEIGHT * title_matches / query_token_count
+        score += self.CONTENT_WEIGHT * content_matches / query_token_count
+
         return score
@@ -1,7 +1,9 @@
 """Middleware for multi-user authentication support."""
 
 import base64
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Callable, Awaitable
 
 from httpx import BasicAuth
@@ -15,99 +17,118 @@ logger = logging.getLogger(__name__)
 
 
 class MultiUserAuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle per-request authentication in multi-user mode."""
-    
-    def __init__(self, app, nextcloud_host: str):
+    """Middleware to handle per-request authentication in multi-user mode.
+
+    Clients are kept in a small LRU cache keyed by username and a hash of the
+    password, so consecutive requests of the same user reuse one client.
+    """
+
+    def __init__(self, app, nextcloud_host: str, max_clients: int = 128):
         super().__init__(app)
         self.nextcloud_host = nextcloud_host
-    
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        self.max_clients = max_clients
+        self._clients: OrderedDict[tuple[str, str], NextcloudClient] = OrderedDict()
+
+    def _get_client(self, username: str, password: str) -> NextcloudClient:
+        """Return the cached client for these credentials, creating it if needed."""
+        key = (username, hashlib.sha256(password.encode("utf-8")).hexdigest())
+        nc_client = self._clients.get(key)
+        if nc_client is not None:
+            self._clients.move_to_end(key)
+            return nc_client
+
+        nc_client = NextcloudClient(
+            base_url=self.nextcloud_host,
+            username=username,
+            auth=BasicAuth(username, password),
+        )
+        self._clients[key] = nc_client
+        if len(self._clients) > self.max_clients:
+            # Evicted clients are not closed: a concurrent request may still be
+            # using it, and the underlying connection pool is shared anyway
+            self._clients.popitem(last=False)
+        return nc_client
+
+    async def dispatch(
+        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
         """Process request and attach per-request NextcloudClient if needed."""
-        
+
         # Check if Authorization header is present
         auth_header = request.headers.get("authorization")
         if not auth_header:
             # Return 401 with JSON error response for MCP compatibility
             from starlette.responses import JSONResponse
+
             return JSONResponse(
                 status_code=401,
                 content={
                     "error": {
                         "code": -32600,
-                        "message": "Authorization header required in multi-user mode"
+                        "message": "Authorization header required in multi-user mode",
                     }
-                }
+                },
             )
-        
+
         # Parse Basic Authentication
         if not auth_header.startswith("Basic "):
             from starlette.responses import JSONResponse
+
             return JSONResponse(
                 status_code=401,
                 content={
                     "error": {
                         "code": -32600,
-                        "message": "Only Basic authentication is supported"
+                        "message": "Only Basic authentication is supported",
                     }
-                }
+                },
             )
-        
+
         try:
             # Extract credentials
             encoded_credentials = auth_header[6:]  # Remove "Basic " prefix
-            decoded_credentials = base64.b64decode(encoded_credentials).decode('utf-8')
-            username, password = decoded_credentials.split(':', 1)
-            
-            # Create per-request client
-            nc_client = NextcloudClient(
-                base_url=self.nextcloud_host,
-                username=username,
-                auth=BasicAuth(username, password)
-            )
-            
+            decoded_credentials = base64.b64decode(encoded_credentials).decode("utf-8")
+            username, password = decoded_credentials.split(":", 1)
+
+            # Reuse (or create) the client for these credentials
+            nc_client = self._get_client(username, password)
+
             # Attach client to request state
             request.state.nc_client = nc_client
-            
+
             # Log request without credentials
             logger.debug(
                 "Multi-user request: %s %s for user: %s",
                 request.method,
                 request.url.path,
-                username
+                username,
             )
-            
-            try:
-                # Process request
-                response = await call_next(request)
-                return response
-            finally:
-                # Always cleanup the client
-                await nc_client.close()
-                
+
+            # Process request
+            response = await call_next(request)
+            return response
+
         except (ValueError, UnicodeDecodeError):
             # Malformed authorization header
             from starlette.responses import JSONResponse
+
             return JSONResponse(
                 status_code=401,
                 content={
                     "error": {
                         "code": -32600,
-                        "message": "Invalid authorization header format"
+                        "message": "Invalid authorization header format",
                     }
-                }
+                },
             )
         except Exception as e:
             # Handle any other errors (e.g., Nextcloud authentication failure)
             logger.error(f"Authentication error: {e}")
             from starlette.responses import JSONResponse
+
             return JSONResponse(
                 status_code=401,
-                content={
-                    "error": {
-                        "code": -32600,
-                        "message": "Authentication failed"
-                    }
-                }
+                content={"error": {"code": -32600, "message": "Authentication failed"}},
             )
 
 
@@ -116,4 +137,4 @@ def redact_auth_headers(headers):
     safe_headers = dict(headers)
     if "authorization" in safe_headers:
         safe_headers["authorization"] = "[REDACTED]"
-    return safe_headers
\ No newline at end of file
+    return safe_headers
@@ -1,9 +1,15 @@
-from .calendar import configure_calendar_tools
-from .notes import configure_notes_tools
-from .tables import configure_tables_tools
-from .webdav import configure_webdav_tools
-from .contacts import configure_contacts_tools
-from .deck import configure_deck_tools
+import importlib
+
+# Tool modules are imported on first access, so that enabling a subset of
+# apps does not pay the import cost of the others
+_TOOL_MODULES = {
+    "configure_calendar_tools": ".calendar",
+    "configure_contacts_tools": ".contacts",
+    "configure_deck_tools": ".deck",
+    "configure_notes_tools": ".notes",
+    "configure_tables_tools": ".tables",
+    "configure_webdav_tools": ".webdav",
+}
 
 __all__ = [
     "configure_calendar_tools",
@@ -13,3 +19,10 @@ __all__ = [
     "configure_tables_tools",
     "configure_webdav_tools",
 ]
+
+
+def __getattr__(name: str):
+    if name in _TOOL_MODULES:
+        module = importlib.import_module(_TOOL_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
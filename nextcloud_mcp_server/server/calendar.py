@@ -1,3 +1,4 @@
+import asyncio
 import datetime as dt
 import logging
 from typing import Optional
@@ -381,28 +382,36 @@ def configure_calendar_tools(mcp: FastMCP):
                 limit=limit,
             )
         else:
-            # Get events from all calendars
+            # Get events from all calendars concurrently, at most 10 at a time
             all_calendars = await client.calendar.list_calendars()
-            all_events = []
+            semaphore = asyncio.Semaphore(10)
 
-            for calendar in all_calendars:
-                try:
-                    events = await client.calendar.get_calendar_events(
+            async def _calendar_events(calendar):
+                async with semaphore:
+                    return await client.calendar.get_calendar_events(
                         calendar_name=calendar["name"],
                         start_datetime=now,
                         end_datetime=end_datetime,
                         limit=limit,
                     )
-                    # Add calendar info to each event
-                    for event in events:
-                        event["calendar_name"] = calendar["name"]
-                        event["calendar_display_name"] = calendar["display_name"]
-                    all_events.extend(events)
-                except Exception as e:
+
+            results = await asyncio.gather(
+                *(_calendar_events(calendar) for calendar in all_calendars),
+                return_exceptions=True,
+            )
+
+            all_events = []
+            for calendar, events in zip(all_calendars, results):
+                if isinstance(events, Exception):
                     logger.warning(
-                        f"Error getting events from calendar {calendar['name']}: {e}"
+                        f"Error getting events from calendar {calendar['name']}: {events}"
                     )
                     continue
+                # Add calendar info to each event
+                for event in events:
+                    event["calendar_name"] = calendar["name"]
+                    event["calendar_display_name"] = calendar["display_name"]
+                all_events.extend(events)
 
             # Sort by start time and limit
             all_events.sort(key=lambda x: x.get("start_datetime", ""))
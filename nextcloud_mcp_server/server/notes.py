@@ -219,11 +219,17 @@ def configure_notes_tools(mcp: FastMCP):
                 )
 
     @mcp.tool()
-    async def nc_notes_search_notes(query: str, ctx: Context) -> SearchNotesResponse:
-        """Search notes by title or content, returning only id, title, and category."""
+    async def nc_notes_search_notes(
+        query: str, ctx: Context, limit: int | None = None
+    ) -> SearchNotesResponse:
+        """Search notes by title or content, returning only id, title, and category.
+
+        Results are ordered by relevance, `limit` caps how many are returned."""
         client: NextcloudClient = get_nc_client(ctx)
         try:
-            search_results_raw = await client.notes_search_notes(query=query)
+            search_results_raw = await client.notes_search_notes(
+                query=query, limit=limit
+            )
 
             # Convert to NoteSearchResult models, including the _score field
             results = [
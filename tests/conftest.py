@@ -1,10 +1,10 @@
 import logging
 import os
 import uuid
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Callable
 
 import pytest
-from httpx import HTTPStatusError
+from httpx import AsyncClient, HTTPStatusError, MockTransport, Request, Response
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
@@ -13,6 +13,19 @@ from nextcloud_mcp_server.client import NextcloudClient
 logger = logging.getLogger(__name__)
 
 
+@pytest.fixture
+def mock_http_client() -> Callable[[Callable[[Request], Response]], AsyncClient]:
+    """
+    Fixture returning a factory for an AsyncClient whose requests are answered
+    by the given handler, for unit tests of the app clients.
+    """
+
+    def make_http_client(handler: Callable[[Request], Response]) -> AsyncClient:
+        return AsyncClient(base_url="https://nc.test", transport=MockTransport(handler))
+
+    return make_http_client
+
+
 @pytest.fixture(scope="session")
 async def nc_client() -> AsyncGenerator[NextcloudClient, Any]:
     """
@@ -0,0 +1,39 @@
+"""Unit tests for the application lifespans."""
+
+import logging
+
+from nextcloud_mcp_server import app
+
+logger = logging.getLogger(__name__)
+
+
+async def test_session_lifespan_keeps_shared_pool_open(monkeypatch):
+    """Ending one MCP session must not close connections of other sessions."""
+    closed = []
+
+    async def close_shared_transport():
+        closed.append(True)
+
+    monkeypatch.setattr(app, "close_shared_transport", close_shared_transport)
+    lifespan = app._create_lifespan({"multi_user": True, "host": "https://nc.test"})
+
+    async with lifespan(None):
+        pass
+
+    assert closed == []
+
+
+async def test_app_lifespan_closes_shared_pool(monkeypatch):
+    """The shared pool is closed once, when the application shuts down."""
+    closed = []
+
+    async def close_shared_transport():
+        closed.append(True)
+
+    monkeypatch.setattr(app, "close_shared_transport", close_shared_transport)
+    starlette_app = app.get_app(transport="sse", enabled_apps=[], multi_user=True)
+
+    async with starlette_app.router.lifespan_context(starlette_app):
+        assert closed == []
+
+    assert closed == [True]
@@ -0,0 +1,108 @@
+"""Unit tests for the shared client request handling."""
+
+import logging
+
+import pytest
+from httpx import HTTPStatusError, Request, Response
+
+from nextcloud_mcp_server.client import base
+from nextcloud_mcp_server.client.notes import NotesClient
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def requests() -> list[Request]:
+    return []
+
+
+@pytest.fixture
+def statuses() -> list[Response]:
+    """The responses the server answers with, in order."""
+    return []
+
+
+@pytest.fixture
+def notes_client(
+    mock_http_client, statuses: list[Response], requests: list[Request]
+) -> NotesClient:
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return statuses.pop(0)
+
+    return NotesClient(mock_http_client(handler), "user")
+
+
+async def test_rate_limited_request_waits_for_retry_after(
+    monkeypatch, notes_client, statuses, requests
+):
+    """A 429 is retried after the delay the server asks for."""
+    delays: list[float] = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(base.asyncio, "sleep", sleep)
+    statuses += [Response(429, headers={"Retry-After": "2"}), Response(200, json={})]
+
+    assert await notes_client.get_settings() == {}
+    assert delays == [2.0]
+    assert len(requests) == 2
+
+
+async def test_unavailable_post_is_not_retried(
+    monkeypatch, notes_client, statuses, requests
+):
+    """A 503 is only retried for idempotent methods."""
+    monkeypatch.setattr(base.asyncio, "sleep", pytest.fail)
+    statuses.append(Response(503))
+
+    with pytest.raises(HTTPStatusError):
+        await notes_client.create_note(title="Meeting")
+    assert len(requests) == 1
+
+
+async def test_retries_stop_after_max_attempts(
+    monkeypatch, notes_client, statuses, requests
+):
+    """A request that keeps being rate limited fails after MAX_RETRIES."""
+
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr(base.asyncio, "sleep", sleep)
+    statuses += [Response(429) for _ in range(base.MAX_RETRIES)]
+
+    with pytest.raises(RuntimeError):
+        await notes_client.get_settings()
+    assert len(requests) == base.MAX_RETRIES
+
+
+async def test_iter_multistatus_detaches_parsed_responses(monkeypatch):
+    """Responses are removed from the document once the consumer moves on."""
+    roots = []
+
+    class RecordingParser(base.ET.XMLPullParser):
+        def read_events(self):
+            for event, elem in super().read_events():
+                if event == "start" and not roots:
+                    roots.append(elem)
+                yield event, elem
+
+    monkeypatch.setattr(base, "lxml_etree", None)
+    monkeypatch.setattr(base.ET, "XMLPullParser", RecordingParser)
+    monkeypatch.setattr(base, "MULTISTATUS_CHUNK_SIZE", 64)
+    responses = "".join(
+        f"<d:response><d:href>/file-{n}</d:href></d:response>" for n in range(100)
+    )
+    body = f'<d:multistatus xmlns:d="DAV:">{responses}</d:multistatus>'.encode()
+
+    hrefs = []
+    async for elem in base.iter_multistatus(Response(207, content=body)):
+        hrefs.append(elem.find("{DAV:}href").text)
+        # Only responses parsed from the current chunk, and one partly
+        # parsed response, are attached
+        assert len(roots[0]) <= 3
+
+    assert hrefs == [f"/file-{n}" for n in range(100)]
+    assert len(roots[0]) == 0
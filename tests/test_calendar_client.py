@@ -0,0 +1,398 @@
+"""Unit tests for the CalDAV calendar client."""
+
+import datetime as dt
+import logging
+from typing import Callable
+
+import pytest
+from httpx import AsyncClient, Request, Response
+
+from nextcloud_mcp_server.client.calendar import CalendarClient
+
+logger = logging.getLogger(__name__)
+
+CALENDARS_BODY = b"""<?xml version="1.0"?>
+<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav"
+    xmlns:cs="http://calendarserver.org/ns/">
+  <d:response>
+    <d:href>/remote.php/dav/calendars/user/</d:href>
+    <d:propstat><d:prop><d:resourcetype><d:collection/></d:resourcetype>
+    </d:prop></d:propstat>
+  </d:response>
+  <d:response>
+    <d:href>/remote.php/dav/calendars/user/personal/</d:href>
+    <d:propstat><d:prop>
+      <d:displayname>Personal</d:displayname>
+      <d:resourcetype><d:collection/><c:calendar/></d:resourcetype>
+      <cs:calendar-color>#FF0000</cs:calendar-color>
+    </d:prop></d:propstat>
+  </d:response>
+</d:multistatus>"""
+
+EVENT = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:event-{n}
+SUMMARY:Meeting {n}
+DTSTART:20250101T100000Z
+DTEND:20250101T110000Z
+END:VEVENT
+END:VCALENDAR"""
+
+
+def _events_body(count: int) -> bytes:
+    responses = "".join(
+        f"""<d:response>
+          <d:href>/remote.php/dav/calendars/user/personal/event-{n}.ics</d:href>
+          <d:propstat><d:prop>
+            <d:getetag>"e{n}"</d:getetag>
+            <c:calendar-data>{EVENT.format(n=n)}</c:calendar-data>
+          </d:prop></d:propstat>
+        </d:response>"""
+        for n in range(count)
+    )
+    return (
+        '<?xml version="1.0"?><d:multistatus xmlns:d="DAV:" '
+        f'xmlns:c="urn:ietf:params:xml:ns:caldav">{responses}</d:multistatus>'
+    ).encode()
+
+
+def _multistatus(body: bytes) -> Callable[[Request], Response]:
+    """A request handler answering every request with this multistatus."""
+
+    def handler(request: Request) -> Response:
+        return Response(207, content=body)
+
+    return handler
+
+
+async def test_list_calendars_returns_calendar_collections(mock_http_client):
+    """Only calendar collections are listed, with their properties."""
+    client = CalendarClient(mock_http_client(_multistatus(CALENDARS_BODY)), "user")
+
+    calendars = await client.list_calendars()
+
+    assert calendars == [
+        {
+            "name": "personal",
+            "display_name": "Personal",
+            "description": "",
+            "color": "#FF0000",
+            "href": "/remote.php/dav/calendars/user/personal/",
+        }
+    ]
+
+
+async def test_get_calendar_events_parses_events_up_to_limit(mock_http_client):
+    """Events are read from the REPORT response, at most `limit` of them."""
+    client = CalendarClient(mock_http_client(_multistatus(_events_body(3))), "user")
+
+    events = await client.get_calendar_events("personal", limit=2)
+
+    assert [(e["uid"], e["title"], e["etag"]) for e in events] == [
+        ("event-0", "Meeting 0", '"e0"'),
+        ("event-1", "Meeting 1", '"e1"'),
+    ]
+
+
+async def test_search_events_across_calendars_skips_failing_calendars(mock_http_client):
+    """Events of every calendar are returned, even if one calendar fails."""
+    broken_calendar = b"""<d:response>
+        <d:href>/remote.php/dav/calendars/user/broken/</d:href>
+        <d:propstat><d:prop>
+          <d:resourcetype><d:collection/><c:calendar/></d:resourcetype>
+        </d:prop></d:propstat>
+      </d:response>
+    </d:multistatus>"""
+    calendars_body = CALENDARS_BODY.replace(b"</d:multistatus>", broken_calendar)
+
+    def handler(request: Request) -> Response:
+        if request.method == "PROPFIND":
+            return Response(207, content=calendars_body)
+        if "broken" in request.url.path:
+            return Response(500)
+        return Response(207, content=_events_body(2))
+
+    client = CalendarClient(mock_http_client(handler), "user")
+
+    events = await client.search_events_across_calendars()
+
+    assert [(e["uid"], e["calendar_name"]) for e in events] == [
+        ("event-0", "personal"),
+        ("event-1", "personal"),
+    ]
+
+
+async def test_get_calendar_events_pushes_text_filters_to_server(mock_http_client):
+    """Title and location filters are sent as CalDAV text-match filters."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(207, content=_events_body(1))
+
+    client = CalendarClient(mock_http_client(handler), "user")
+
+    await client.get_calendar_events(
+        "personal", filters={"title_contains": "R&D", "status": "CONFIRMED"}
+    )
+
+    body = requests[0].content.decode()
+    assert '<c:prop-filter name="SUMMARY">' in body
+    assert ">R&amp;D</c:text-match>" in body
+    assert "LOCATION" not in body and "STATUS" not in body
+
+
+async def test_get_calendar_events_matches_numeric_text_filter(mock_http_client):
+    """Numbers given as text filters are matched as text."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(207, content=_events_body(1))
+
+    client = CalendarClient(mock_http_client(handler), "user")
+
+    await client.get_calendar_events("personal", filters={"location_contains": 101})
+
+    assert ">101</c:text-match>" in requests[0].content.decode()
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"title_contains": ["Meeting"]},
+        {"min_attendees": "two"},
+        {"categories": "work"},
+        {"start_date": "tomorrow"},
+        {"organizer": "alice"},
+    ],
+)
+async def test_search_events_across_calendars_rejects_invalid_filters(
+    mock_http_client, filters
+):
+    """Invalid filters fail the search instead of skipping every calendar."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.method == "PROPFIND":
+            return Response(207, content=CALENDARS_BODY)
+        return Response(207, content=_events_body(1))
+
+    client = CalendarClient(mock_http_client(handler), "user")
+
+    with pytest.raises(ValueError, match="event filter"):
+        await client.search_events_across_calendars(filters=filters)
+    assert requests == []
+
+
+async def test_list_calendars_is_cached_until_calendars_change(mock_http_client):
+    """A repeated listing is served from the cache until a calendar is created."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.method == "MKCALENDAR":
+            return Response(201)
+        return Response(207, content=CALENDARS_BODY)
+
+    client = CalendarClient(mock_http_client(handler), "user")
+
+    first = await client.list_calendars()
+    first[0]["name"] = "changed"
+    assert (await client.list_calendars())[0]["name"] == "personal"
+
+    await client.create_calendar("work")
+    await client.list_calendars()
+
+    assert [r.method for r in requests] == ["PROPFIND", "MKCALENDAR", "PROPFIND"]
+
+
+async def test_update_event_with_existing_event_skips_fetch(mock_http_client):
+    """A parsed event passed by the caller replaces fetching the current one."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(204, headers={"ETag": '"e2"'})
+
+    client = CalendarClient(mock_http_client(handler), "user")
+    existing = {
+        "uid": "event-0",
+        "title": "Meeting 0",
+        "location": "Room 1",
+        "start_datetime": "2025-01-01T10:00:00+00:00",
+        "end_datetime": "2025-01-01T11:00:00+00:00",
+        "etag": '"e1"',
+    }
+
+    result = await client.update_event(
+        "personal", "event-0", {"title": "Review"}, existing_event_data=existing
+    )
+
+    assert result["etag"] == '"e2"'
+    assert [r.method for r in requests] == ["PUT"]
+    assert requests[0].headers["If-Match"] == '"e1"'
+    body = requests[0].content.decode()
+    assert "SUMMARY:Review" in body and "LOCATION:Room 1" in body
+
+
+def test_parse_ical_event_matches_icalendar_parsing():
+    """Scanned content lines give the same event data as icalendar."""
+    client = CalendarClient(AsyncClient(), "user")
+    ical = (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\nUID:event-1\r\n"
+        "SUMMARY:Review\\, part 2\r\nLOCATION:Room\r\n  1\r\n"
+        "DTSTART;TZID=Europe/Berlin:20250101T100000\r\n"
+        "DTEND;VALUE=DATE:20250102\r\nRRULE:FREQ=WEEKLY;BYDAY=MO\r\n"
+        'CATEGORIES:Work,Team\r\nATTENDEE;CN="Doe: Jane":mailto:jane@nc.test\r\n'
+        "BEGIN:VALARM\r\nDESCRIPTION:Reminder\r\nEND:VALARM\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+    scanned = client._scan_ical_event(ical)
+    client._scan_ical_event = lambda ical_text: None
+
+    assert scanned == client._parse_ical_event(ical)
+    assert scanned["title"] == "Review, part 2"
+    assert scanned["location"] == "Room 1"
+    assert scanned["start_datetime"] == "2025-01-01T10:00:00+01:00"
+    assert scanned["description"] == ""
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        "CATEGORIES:R\\,D,Work\\;Team\r\nCATEGORIES:a\\\\b",
+        "RRULE:BYDAY=MO,WE;COUNT=5;FREQ=WEEKLY",
+        "SUMMARY:Line\\nbreak \\x",
+        "URL:https://nc.test/a\\,b\\;c",
+        "DESCRIPTION:a\u2028SUMMARY:evil\x0cb\r\nSUMMARY:real",
+    ],
+)
+def test_scanned_escapes_and_rules_match_icalendar_parsing(lines):
+    """Escaped categories and recurrence rules are read as icalendar does."""
+    client = CalendarClient(AsyncClient(), "user")
+    ical = (
+        "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:event-1\r\n"
+        f"DTSTART:20250101T100000Z\r\n{lines}\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+    scanned = client._scan_ical_event(ical)
+    client._scan_ical_event = lambda ical_text: None
+
+    assert scanned == client._parse_ical_event(ical)
+
+
+def test_scanned_values_keep_unicode_line_separators():
+    """Only CRLF and LF end content lines, values may contain U+2028."""
+    client = CalendarClient(AsyncClient(), "user")
+    ical = (
+        "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:event-1\r\n"
+        "DESCRIPTION:a\u2028SUMMARY:evil\r\nSUMMARY:real\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+    event = client._scan_ical_event(ical)
+
+    assert event["title"] == "real"
+    assert event["description"] == "a\u2028SUMMARY:evil"
+
+
+def test_create_ical_event_writes_valid_folded_icalendar():
+    """Generated iCalendar parses back to the event data, lines are folded."""
+    client = CalendarClient(AsyncClient(), "user")
+    event_data = {
+        "title": "Review, part 2; " + "ü" * 60,
+        "location": "Room 1",
+        "start_datetime": "2025-01-01T10:00:00+01:00",
+        "end_datetime": "2025-01-01T11:00:00Z",
+        "categories": "Work,Team",
+        "recurring": True,
+        "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO",
+        "attendees": "jane@nc.test, joe@nc.test",
+        "reminder_minutes": 90,
+    }
+
+    ical = client._create_ical_event(event_data, "event-1")
+
+    assert ical.endswith("END:VCALENDAR\r\n")
+    assert all(len(line.encode()) <= 75 for line in ical.split("\r\n"))
+    assert "TRIGGER:-PT1H30M" in ical
+    client._scan_ical_event = lambda ical_text: None
+    event = client._parse_ical_event(ical)
+    assert event["title"] == event_data["title"]
+    assert event["start_datetime"] == "2025-01-01T09:00:00+00:00"
+    assert event["end_datetime"] == "2025-01-01T11:00:00+00:00"
+    assert event["categories"] == "Work, Team"
+    assert event["recurrence_rule"] == "FREQ=WEEKLY;BYDAY=MO"
+    assert event["attendees"] == "jane@nc.test,joe@nc.test"
+
+
+def test_generate_available_slots_avoids_busy_periods_of_each_day():
+    """Busy events only block slots on the day they start."""
+    client = CalendarClient(AsyncClient(), "user")
+    busy_events = [
+        {
+            "start_datetime": "2025-01-01T08:00:00",
+            "end_datetime": "2025-01-01T20:00:00",
+        },
+        {
+            "start_datetime": "2025-01-02T08:00:00",
+            "end_datetime": "2025-01-02T12:00:00",
+        },
+        {"start_datetime": "not a date", "end_datetime": ""},
+    ]
+
+    slots = client._generate_available_slots(
+        busy_events,
+        60,
+        dt.datetime(2025, 1, 1),
+        dt.datetime(2025, 1, 2),
+        business_hours_only=False,
+        exclude_weekends=False,
+        preferred_times=[],
+    )
+
+    assert [s["start_datetime"][11:16] for s in slots[:3]] == [
+        "12:00",
+        "12:30",
+        "13:00",
+    ]
+    assert {s["date"] for s in slots} == {"2025-01-02"}
+    assert len(slots) == 10
+
+
+def test_apply_event_filters_ignores_case_of_filter_values():
+    """Filter values match regardless of case, events are not modified."""
+    client = CalendarClient(AsyncClient(), "user")
+    events = [
+        {"title": "Team Review", "status": "confirmed", "categories": "Work"},
+        {"title": "Lunch", "status": "CONFIRMED", "categories": "Personal"},
+    ]
+    filters = {
+        "title_contains": "REVIEW",
+        "status": "Confirmed",
+        "categories": ["WORK"],
+    }
+
+    assert client._apply_event_filters(events, filters) == [events[0]]
+    assert filters["title_contains"] == "REVIEW"
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"min_duration_minutes": "an hour"},
+        {"min_attendees": None},
+        {"end_date": "2025-13-01"},
+    ],
+)
+def test_apply_event_filters_rejects_malformed_filters(filters):
+    """Malformed filters raise instead of matching every event."""
+    client = CalendarClient(AsyncClient(), "user")
+    events = [{"title": "Lunch", "start_datetime": "2025-01-01T12:00:00"}]
+
+    with pytest.raises(ValueError, match="event filter"):
+        client._apply_event_filters(events, filters)
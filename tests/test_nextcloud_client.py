@@ -0,0 +1,131 @@
+"""Unit tests for the Nextcloud client."""
+
+import inspect
+import json
+import logging
+from operator import attrgetter
+
+import pytest
+from httpx import ByteStream, MockTransport, Request, Response
+
+import nextcloud_mcp_server.client as client_module
+from nextcloud_mcp_server.client import NextcloudClient, _env_int, log_response
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def requests() -> list[Request]:
+    return []
+
+
+@pytest.fixture
+def client(requests: list[Request]) -> NextcloudClient:
+    """A client answering note requests with the note of the requested id."""
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.method == "POST":
+            return Response(200, json={"id": 7, **json.loads(request.content)})
+        return Response(200, json={"id": int(request.url.path.rsplit("/", 1)[1])})
+
+    client = NextcloudClient("https://nc.test", "user")
+    client._client._transport = MockTransport(handler)
+    return client
+
+
+async def test_batch_passes_results_to_dependent_calls(client, requests):
+    """Referenced results are resolved before the dependent call runs."""
+    created, fetched, other = await client.batch(
+        [
+            ("notes.create_note", {"title": "Meeting"}),
+            ("notes.get_note", {"note_id": {"$ref": 0, "field": "id"}}),
+            ("notes.get_note", {"note_id": 3}),
+        ]
+    )
+
+    assert created == {"id": 7, "title": "Meeting"}
+    assert fetched == {"id": 7}
+    assert other == {"id": 3}
+    assert requests[-1].url.path == "/apps/notes/api/v1/notes/7"
+
+
+def test_batch_methods_are_app_client_coroutines():
+    """Every batch method is a public coroutine method of an app client."""
+    client = NextcloudClient("https://nc.test", "user")
+
+    for method in NextcloudClient.BATCH_METHODS:
+        _, name = method.split(".")
+        assert not name.startswith("_")
+        assert inspect.iscoroutinefunction(attrgetter(method)(client)), method
+
+
+@pytest.mark.parametrize(
+    "calls",
+    [
+        [("close", {})],
+        [("_client.aclose", {})],
+        [("notes._client.aclose", {})],
+        [("notes.get_note", {"note_id": {"$ref": 1}})],
+        [("notes.get_note", {"note_id": {"$ref": 0}})],
+        [("notes.get_note", {"note_id": {"$ref": "0"}})],
+        [
+            ("notes.get_note", {"note_id": 1}),
+            ("notes.get_note", {"note_id": {"$ref": 0, "field": ["id"]}}),
+        ],
+    ],
+)
+async def test_batch_rejects_invalid_calls(client, requests, calls):
+    """Calls outside BATCH_METHODS and invalid $refs fail before any request."""
+    with pytest.raises(ValueError, match="Call 0|Call 1"):
+        await client.batch(calls)
+
+    assert requests == []
+
+
+async def test_batch_rejects_missing_referenced_field(client, requests):
+    """A referenced field missing from the result fails the dependent call."""
+    with pytest.raises(ValueError, match="has no field 'note_id'"):
+        await client.batch(
+            [
+                ("notes.get_note", {"note_id": 1}),
+                ("notes.get_note", {"note_id": {"$ref": 0, "field": "note_id"}}),
+            ]
+        )
+
+    assert len(requests) == 1
+
+
+@pytest.mark.parametrize("value", ["many", "", "0", "-5"])
+def test_env_int_falls_back_to_default_on_invalid_value(monkeypatch, value):
+    """Invalid pool settings are logged and replaced by their default."""
+    warnings: list[tuple] = []
+    monkeypatch.setattr(client_module.logger, "warning", lambda *a: warnings.append(a))
+    monkeypatch.setenv("NCMCP_CONCURRENCY", value)
+
+    assert _env_int("NCMCP_CONCURRENCY", 64) == 64
+    assert [w[2] for w in warnings] == ["NCMCP_CONCURRENCY"]
+
+
+def test_env_int_reads_valid_value(monkeypatch):
+    monkeypatch.setenv("NCMCP_CONCURRENCY", " 8 ")
+
+    assert _env_int("NCMCP_CONCURRENCY", 64) == 8
+
+
+@pytest.mark.parametrize("content_length", ["12, 12", "twelve"])
+async def test_log_response_elides_body_of_invalid_length(monkeypatch, content_length):
+    """A malformed Content-Length is logged like a missing one."""
+    messages: list[tuple] = []
+    monkeypatch.setattr(client_module.logger, "isEnabledFor", lambda level: True)
+    monkeypatch.setattr(client_module.logger, "debug", lambda *a: messages.append(a))
+    response = Response(
+        200,
+        headers={"Content-Type": "text/plain", "Content-Length": content_length},
+        stream=ByteStream(b"hello world!"),
+    )
+
+    await log_response(response)
+
+    assert messages == [("Response [%s] (%s bytes, body elided)", 200, "unknown")]
+    assert not response.is_stream_consumed
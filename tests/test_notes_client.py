@@ -0,0 +1,288 @@
+"""Unit tests for the notes client."""
+
+import asyncio
+import json
+import logging
+
+import pytest
+from httpx import HTTPStatusError, Request, Response
+
+from nextcloud_mcp_server.client.notes import LISTING_CACHE_SIZE, NotesClient
+
+logger = logging.getLogger(__name__)
+
+NOTE = {
+    "id": 1,
+    "title": "Meeting",
+    "content": "agenda",
+    "category": "",
+    "modified": 0,
+    "etag": "e1",
+}
+
+
+@pytest.fixture
+def requests() -> list[Request]:
+    return []
+
+
+@pytest.fixture
+def notes_client(mock_http_client, requests: list[Request]) -> NotesClient:
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.method == "PUT" and request.headers["If-Match"] == '"stale"':
+            return Response(412)
+        if request.method == "PUT":
+            return Response(
+                200, json={**NOTE, **json.loads(request.content), "etag": "e2"}
+            )
+        return Response(200, json=NOTE)
+
+    return NotesClient(mock_http_client(handler), "user")
+
+
+async def test_update_only_revalidates_unchanged_note(notes_client, requests):
+    """An update that matches the last seen version of a note is not sent,
+    the note is only revalidated."""
+    await notes_client.get_note(1)
+
+    note = await notes_client.update(note_id=1, etag="e1", content="agenda")
+
+    assert note == NOTE
+    assert [r.method for r in requests] == ["GET", "GET"]
+    assert requests[1].headers["If-None-Match"] == '"e1"'
+
+
+async def test_update_fails_when_server_copy_changed(mock_http_client):
+    """A seemingly unchanged update of a note changed on the server fails."""
+    requests: list[Request] = []
+    server_note = dict(NOTE)
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.method == "PUT":
+            if request.headers["If-Match"] != f'"{server_note["etag"]}"':
+                return Response(412)
+            return Response(200, json=server_note)
+        if request.headers.get("If-None-Match") == f'"{server_note["etag"]}"':
+            return Response(304)
+        return Response(200, json=server_note)
+
+    client = NotesClient(mock_http_client(handler), "user")
+    await client.get_note(1)
+    server_note.update(content="changed elsewhere", etag="e2")
+
+    with pytest.raises(HTTPStatusError) as exc_info:
+        await client.update(note_id=1, etag="e1", content="agenda")
+
+    assert exc_info.value.response.status_code == 412
+    assert [r.method for r in requests] == ["GET", "GET", "PUT"]
+
+
+async def test_update_sends_request_when_content_or_etag_differs(
+    notes_client, requests
+):
+    """Changed content, or a stale etag, still goes to the server."""
+    await notes_client.get_note(1)
+
+    note = await notes_client.update(note_id=1, etag="e1", content="minutes")
+    assert note["etag"] == "e2"
+
+    await notes_client.update(note_id=1, etag="e1", content="minutes")
+    assert [r.method for r in requests] == ["GET", "PUT", "PUT"]
+
+
+async def test_append_content_uses_last_seen_note(notes_client, requests):
+    """Appending to a recently seen note skips fetching it again."""
+    await notes_client.get_note(1)
+
+    note = await notes_client.append_content(1, "minutes")
+
+    assert note["content"] == "agenda\n---\nminutes"
+    assert [r.method for r in requests] == ["GET", "PUT"]
+    assert requests[1].headers["If-Match"] == '"e1"'
+
+
+async def test_append_content_refetches_note_on_stale_etag(notes_client, requests):
+    """A 412 for the last seen version refetches the note and retries."""
+    await notes_client.get_note(1)
+    notes_client._seen_notes[1][1]["etag"] = "stale"
+
+    note = await notes_client.append_content(1, "minutes")
+
+    assert note["content"] == "agenda\n---\nminutes"
+    assert [r.method for r in requests] == ["GET", "PUT", "GET", "PUT"]
+    assert requests[3].headers["If-Match"] == '"e1"'
+
+
+async def test_metadata_listing_is_revalidated_with_etag(mock_http_client):
+    """A repeated metadata listing sends If-None-Match and reuses a 304."""
+    requests: list[Request] = []
+    listing = [{k: v for k, v in NOTE.items() if k != "content"}]
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"l1"':
+            return Response(304)
+        return Response(200, json=listing, headers={"ETag": '"l1"'})
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    assert await client.get_all_notes(exclude="content") == listing
+    assert await client.get_all_notes(exclude="content") == listing
+    assert "chunkSize" not in requests[0].url.params
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"l1"'
+
+
+async def test_update_with_category_uses_last_seen_note(notes_client, requests):
+    """The current category of a seen note is known without fetching it."""
+    await notes_client.get_note(1)
+
+    note = await notes_client.update(
+        note_id=1, etag="e1", content="minutes", category=""
+    )
+
+    assert note["etag"] == "e2"
+    assert [r.method for r in requests] == ["GET", "PUT"]
+
+
+async def test_get_note_is_revalidated_with_etag(mock_http_client):
+    """A seen note is requested with If-None-Match and reused on a 304."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"e1"':
+            return Response(304)
+        return Response(200, json=NOTE)
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    assert await client.get_note(1) == NOTE
+    assert await client.get_note(1) == NOTE
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"e1"'
+
+
+async def test_get_notes_returns_notes_in_requested_order(mock_http_client):
+    """Several notes are fetched at once and returned in the given order."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        note_id = int(request.url.path.rsplit("/", 1)[1])
+        return Response(200, json={**NOTE, "id": note_id})
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    notes = await client.get_notes([3, 1, 2])
+
+    assert [note["id"] for note in notes] == [3, 1, 2]
+    assert len(requests) == 3
+
+
+async def test_get_all_notes_filters_by_category_on_the_server(mock_http_client):
+    """The category is passed to the server instead of filtering locally."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, json=[NOTE])
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    await client.get_all_notes(category="Work")
+    await client.get_all_notes(exclude="content", category="Work")
+
+    assert [r.url.params["category"] for r in requests] == ["Work", "Work"]
+
+
+async def test_concurrent_metadata_listings_share_one_request(mock_http_client):
+    """Listings requested at the same time are served by a single GET."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, json=[NOTE])
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    listings = await asyncio.gather(
+        *(client.get_all_notes(exclude="content") for _ in range(3))
+    )
+
+    assert listings == [[NOTE]] * 3
+    assert listings[0] is not listings[1]
+    assert len(requests) == 1
+
+
+async def test_metadata_listing_returns_copies_of_cached_notes(mock_http_client):
+    """Changing a listed note changes neither the cache nor other listings."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"l1"':
+            return Response(304)
+        return Response(200, json=[NOTE], headers={"ETag": '"l1"'})
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    first, second = await asyncio.gather(
+        *(client.get_all_notes(exclude="content") for _ in range(2))
+    )
+    first[0]["title"] = "Changed"
+
+    assert second == [NOTE]
+    assert await client.get_all_notes(exclude="content") == [NOTE]
+    assert len(requests) == 2
+
+
+async def test_metadata_listing_cache_keeps_recent_listings(mock_http_client):
+    """Only the most recently used listings are kept for revalidation."""
+
+    def handler(request: Request) -> Response:
+        return Response(200, json=[], headers={"ETag": '"l1"'})
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    for n in range(LISTING_CACHE_SIZE + 1):
+        await client.get_all_notes(exclude="content", category=str(n))
+
+    assert len(client._listing_cache) == LISTING_CACHE_SIZE
+    assert ("content", "0") not in client._listing_cache
+
+
+async def test_failed_metadata_listing_fails_every_caller(mock_http_client):
+    """A failed shared listing is raised to each caller and not reused."""
+    statuses = [500, 200]
+
+    def handler(request: Request) -> Response:
+        return Response(statuses.pop(0), json=[NOTE])
+
+    client = NotesClient(mock_http_client(handler), "user")
+
+    results = await asyncio.gather(
+        *(client.get_all_notes(exclude="content") for _ in range(2)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, HTTPStatusError) for result in results)
+    assert client._listing_requests == {}
+    assert await client.get_all_notes(exclude="content") == [NOTE]
+
+
+async def test_update_notes_reports_failures_per_note(notes_client, requests):
+    """A failed update in a bulk call does not fail the other updates."""
+
+    results = await notes_client.update_notes(
+        [
+            {"note_id": 1, "etag": "e1", "content": "minutes"},
+            {"note_id": 1, "etag": "stale", "content": "minutes"},
+        ]
+    )
+
+    assert results[0]["etag"] == "e2"
+    assert isinstance(results[1], HTTPStatusError)
+    assert results[1].response.status_code == 412
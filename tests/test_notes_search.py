@@ -0,0 +1,97 @@
+"""Unit tests for the notes search controller."""
+
+import logging
+
+from nextcloud_mcp_server.controllers.notes_search import NotesSearchController
+
+logger = logging.getLogger(__name__)
+
+
+def _note(note_id: int, title: str, content: str, etag: str = "e1") -> dict:
+    return {
+        "id": note_id,
+        "title": title,
+        "content": content,
+        "category": "",
+        "modified": 0,
+        "etag": etag,
+    }
+
+
+def test_search_ranks_title_matches_above_content_matches():
+    """A query token found in the title weighs more than one in the content."""
+    notes = [
+        _note(1, "Groceries", "buy apples and pears"),
+        _note(2, "Apples", "a list of varieties"),
+        _note(3, "Unrelated", "nothing to see here"),
+    ]
+    results = NotesSearchController().search_notes(notes, "apples")
+
+    assert [r["id"] for r in results] == [2, 1]
+    assert results[0]["_score"] == 3.0
+    assert results[1]["_score"] == 1.0
+
+
+def test_search_ignores_short_and_empty_queries():
+    """Single character tokens are dropped, leaving nothing to search for."""
+    notes = [_note(1, "a b c", "a b c")]
+    assert NotesSearchController().search_notes(notes, "a b") == []
+
+
+def test_search_reuses_index_until_etag_changes():
+    """The index is rebuilt only when a note's etag changes."""
+    controller = NotesSearchController()
+    notes = [_note(1, "Meeting", "agenda")]
+    assert [r["id"] for r in controller.search_notes(notes, "agenda")] == [1]
+
+    # Same etag: the previously indexed content is used
+    stale = [_note(1, "Meeting", "minutes")]
+    assert [r["id"] for r in controller.search_notes(stale, "agenda")] == [1]
+
+    # New etag: the note is re-tokenized
+    updated = [_note(1, "Meeting", "minutes", etag="e2")]
+    assert controller.search_notes(updated, "agenda") == []
+    assert [r["id"] for r in controller.search_notes(updated, "minutes")] == [1]
+
+
+def test_search_uses_cached_tokens_for_notes_without_content():
+    """Notes listed without content are searched using their cached tokens."""
+    controller = NotesSearchController()
+    notes = [_note(1, "Meeting", "agenda"), _note(2, "Trip", "luggage")]
+    controller.search_notes(notes, "agenda")
+
+    listing = [{k: v for k, v in n.items() if k != "content"} for n in notes]
+    listing[1]["etag"] = "e2"
+    assert controller.uncached_note_ids(listing) == [2]
+
+    listing[1] = _note(2, "Trip", "passport", etag="e2")
+    assert [r["id"] for r in controller.search_notes(listing, "agenda")] == [1]
+    assert [r["id"] for r in controller.search_notes(listing, "passport")] == [2]
+
+
+def test_search_ignores_punctuation_around_words():
+    """Punctuation attached to a word does not prevent it from matching."""
+    notes = [_note(1, "Shopping (draft)", "Buy apples, pears.")]
+    controller = NotesSearchController()
+    assert [r["id"] for r in controller.search_notes(notes, "apples?")] == [1]
+    assert [r["id"] for r in controller.search_notes(notes, "DRAFT")] == [1]
+
+
+def test_search_drops_deleted_notes_from_index():
+    """Notes missing from a later listing are no longer returned."""
+    controller = NotesSearchController()
+    notes = [_note(1, "Meeting", "agenda"), _note(2, "Review", "agenda")]
+    assert [r["id"] for r in controller.search_notes(notes, "agenda")] == [1, 2]
+    assert [r["id"] for r in controller.search_notes(notes[1:], "agenda")] == [2]
+    assert controller.uncached_note_ids(notes) == [1]
+
+
+def test_search_limit_returns_top_results():
+    """With a limit, only the best scoring notes are returned, in order."""
+    notes = [
+        _note(1, "Groceries", "apples"),
+        _note(2, "Apples", "apples"),
+        _note(3, "Apples", "pears"),
+    ]
+    results = NotesSearchController().search_notes(notes, "apples", limit=2)
+    assert [r["id"] for r in results] == [2, 3]
@@ -0,0 +1,303 @@
+"""Unit tests for the WebDAV client."""
+
+import io
+import logging
+
+import pytest
+from httpx import AsyncByteStream, HTTPStatusError, ReadError, Request, Response
+
+from nextcloud_mcp_server.client.webdav import UPLOAD_CHUNK_SIZE, WebDAVClient
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENTS_DIR = "/remote.php/dav/files/user/Notes/.attachments.1"
+
+
+@pytest.fixture
+def requests() -> list[Request]:
+    return []
+
+
+@pytest.fixture
+def existing_dirs() -> set[str]:
+    return set()
+
+
+@pytest.fixture
+def webdav_client(
+    mock_http_client, requests: list[Request], existing_dirs: set[str]
+) -> WebDAVClient:
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        parent = request.url.path.rsplit("/", 1)[0]
+        if request.method == "MKCOL":
+            existing_dirs.add(request.url.path)
+            return Response(201)
+        if request.method == "PUT" and parent not in existing_dirs:
+            return Response(409)
+        if request.method == "MOVE":
+            destination_parent = request.headers["Destination"].rsplit("/", 1)[0]
+            if destination_parent not in existing_dirs:
+                return Response(409)
+        return Response(201)
+
+    return WebDAVClient(mock_http_client(handler), "user")
+
+
+async def test_add_note_attachment_uploads_directly_into_existing_directory(
+    webdav_client, requests, existing_dirs
+):
+    """No MKCOL is sent when the attachments directory already exists."""
+    existing_dirs.add(ATTACHMENTS_DIR)
+
+    result = await webdav_client.add_note_attachment(1, "a.png", b"data")
+
+    assert result == {"status_code": 201}
+    assert [r.method for r in requests] == ["PUT"]
+
+
+async def test_add_note_attachment_creates_missing_directory_on_conflict(
+    webdav_client, requests
+):
+    """A 409 from the upload creates the directory and retries once."""
+    result = await webdav_client.add_note_attachment(1, "a.png", b"data")
+
+    assert result == {"status_code": 201}
+    assert [(r.method, r.url.path) for r in requests] == [
+        ("PUT", f"{ATTACHMENTS_DIR}/a.png"),
+        ("MKCOL", ATTACHMENTS_DIR),
+        ("PUT", f"{ATTACHMENTS_DIR}/a.png"),
+    ]
+
+
+async def test_add_note_attachment_reads_file_objects(
+    webdav_client, requests, existing_dirs
+):
+    """Binary file objects are uploaded like raw bytes."""
+    existing_dirs.add(ATTACHMENTS_DIR)
+
+    await webdav_client.add_note_attachment(1, "a.txt", io.BytesIO(b"data"))
+
+    assert requests[0].content == b"data"
+
+
+async def test_get_note_attachment_streams_to_file(mock_http_client, tmp_path):
+    """With stream_to, the attachment is written to disk."""
+
+    def handler(request: Request) -> Response:
+        return Response(200, content=b"data", headers={"Content-Type": "text/plain"})
+
+    client = WebDAVClient(mock_http_client(handler), "user")
+
+    destination = tmp_path / "a.txt"
+    content, mime_type = await client.get_note_attachment(
+        1, "a.txt", stream_to=destination
+    )
+
+    assert (content, mime_type) == (b"", "text/plain")
+    assert destination.read_bytes() == b"data"
+
+
+async def test_failed_download_leaves_no_partial_file(mock_http_client, tmp_path):
+    """A download failing partway keeps the previous file and no partial one."""
+
+    class FailingStream(AsyncByteStream):
+        async def __aiter__(self):
+            yield b"partial"
+            raise ReadError("connection lost")
+
+    def handler(request: Request) -> Response:
+        return Response(200, stream=FailingStream())
+
+    client = WebDAVClient(mock_http_client(handler), "user")
+    destination = tmp_path / "a.txt"
+    destination.write_bytes(b"previous")
+
+    with pytest.raises(ReadError):
+        await client.get_note_attachment(1, "a.txt", stream_to=destination)
+
+    assert list(tmp_path.iterdir()) == [destination]
+    assert destination.read_bytes() == b"previous"
+
+
+async def test_iter_note_attachment_yields_bounded_chunks(mock_http_client):
+    """Attachments can be consumed in chunks instead of as one buffer."""
+    requests: list[Request] = []
+    content = b"x" * 100_000
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, content=content)
+
+    client = WebDAVClient(mock_http_client(handler), "user")
+
+    chunks = [chunk async for chunk in client.iter_note_attachment(1, "a.bin")]
+
+    assert b"".join(chunks) == content
+    assert max(len(chunk) for chunk in chunks) <= 65536
+    assert requests[0].url.path == f"{ATTACHMENTS_DIR}/a.bin"
+
+
+async def test_list_directory_parses_streamed_multistatus(mock_http_client):
+    """Entries are read from the PROPFIND response, skipping the directory."""
+    body = b"""<?xml version="1.0"?>
+    <d:multistatus xmlns:d="DAV:">
+        <d:response><d:href>/remote.php/dav/files/user/Docs/</d:href>
+            <d:propstat><d:prop><d:resourcetype><d:collection/></d:resourcetype>
+            </d:prop></d:propstat></d:response>
+        <d:response><d:href>/remote.php/dav/files/user/Docs/a.txt</d:href>
+            <d:propstat><d:prop><d:resourcetype/>
+            <d:getcontentlength>3</d:getcontentlength>
+            <d:getcontenttype>text/plain</d:getcontenttype>
+            </d:prop></d:propstat></d:response>
+    </d:multistatus>"""
+
+    def handler(request: Request) -> Response:
+        return Response(207, content=body)
+
+    client = WebDAVClient(mock_http_client(handler), "user")
+
+    items = await client.list_directory("Docs")
+
+    assert [(i["path"], i["size"], i["is_directory"]) for i in items] == [
+        ("Docs/a.txt", 3, False)
+    ]
+
+
+async def test_attachment_file_names_are_percent_encoded(
+    webdav_client, requests, existing_dirs
+):
+    """Characters such as '#' and '?' stay part of the attachment path."""
+    existing_dirs.add("/remote.php/dav/files/user/Notes/My Work/.attachments.1")
+
+    await webdav_client.add_note_attachment(1, "a#1?.png", b"data", category="My Work")
+
+    assert len(requests) == 1
+    assert requests[0].url.raw_path.decode() == (
+        "/remote.php/dav/files/user/Notes/My%20Work/.attachments.1/a%231%3F.png"
+    )
+
+
+async def test_delete_resource_reports_missing_resource(mock_http_client):
+    """Deleting a resource that does not exist returns its 404 status."""
+
+    def handler(request: Request) -> Response:
+        return Response(404)
+
+    client = WebDAVClient(mock_http_client(handler), "user")
+
+    assert await client.delete_resource("Notes/.attachments.1") == {"status_code": 404}
+
+
+def _upload_requests(requests: list[Request]) -> list[tuple[str, str]]:
+    """The method and path of each request, with the random upload id
+    replaced by `<id>`."""
+    upload_path = next(r.url.path for r in requests if r.method == "MKCOL")
+    return [
+        (r.method, r.url.path.replace(upload_path, "/uploads/<id>")) for r in requests
+    ]
+
+
+async def test_large_attachment_is_uploaded_in_chunks(
+    webdav_client, requests, existing_dirs
+):
+    """Attachments above one chunk go through the chunked upload v2 API."""
+    existing_dirs.add(ATTACHMENTS_DIR)
+    content = b"a" * UPLOAD_CHUNK_SIZE + b"b" * UPLOAD_CHUNK_SIZE + b"c" * 5
+
+    result = await webdav_client.add_note_attachment(1, "a.bin", content)
+
+    assert result == {"status_code": 201}
+    assert _upload_requests(requests) == [
+        ("MKCOL", "/uploads/<id>"),
+        ("PUT", "/uploads/<id>/00001"),
+        ("PUT", "/uploads/<id>/00002"),
+        ("PUT", "/uploads/<id>/00003"),
+        ("MOVE", "/uploads/<id>/.file"),
+    ]
+    assert requests[0].url.path.startswith("/remote.php/dav/uploads/user/")
+    assert {r.headers["Destination"] for r in requests} == {f"{ATTACHMENTS_DIR}/a.bin"}
+    assert [r.content for r in requests[1:4]] == [
+        b"a" * UPLOAD_CHUNK_SIZE,
+        b"b" * UPLOAD_CHUNK_SIZE,
+        b"c" * 5,
+    ]
+
+
+async def test_chunks_do_not_follow_the_pieces_of_streamed_content(
+    webdav_client, requests, existing_dirs
+):
+    """Streamed content is cut at chunk boundaries, not where pieces end."""
+    existing_dirs.add(ATTACHMENTS_DIR)
+    piece = b"x" * (UPLOAD_CHUNK_SIZE * 2 // 3)
+
+    async def pieces():
+        for _ in range(4):
+            yield piece
+
+    await webdav_client.add_note_attachment(1, "a.bin", pieces())
+
+    parts = [r.content for r in requests if r.method == "PUT"]
+    assert [len(part) for part in parts] == [
+        UPLOAD_CHUNK_SIZE,
+        UPLOAD_CHUNK_SIZE,
+        len(piece) * 4 - 2 * UPLOAD_CHUNK_SIZE,
+    ]
+
+
+async def test_attachment_of_exactly_one_chunk_is_uploaded_directly(
+    webdav_client, requests, existing_dirs
+):
+    """Content that fits one chunk is sent with a single PUT."""
+    existing_dirs.add(ATTACHMENTS_DIR)
+
+    await webdav_client.add_note_attachment(1, "a.bin", b"a" * UPLOAD_CHUNK_SIZE)
+
+    assert [(r.method, r.url.path) for r in requests] == [
+        ("PUT", f"{ATTACHMENTS_DIR}/a.bin")
+    ]
+
+
+async def test_chunked_upload_creates_missing_directory_on_move(
+    webdav_client, requests
+):
+    """A 409 from the final MOVE creates the directory and moves again."""
+    content = b"a" * (UPLOAD_CHUNK_SIZE + 1)
+
+    result = await webdav_client.add_note_attachment(1, "a.bin", content)
+
+    assert result == {"status_code": 201}
+    assert _upload_requests(requests) == [
+        ("MKCOL", "/uploads/<id>"),
+        ("PUT", "/uploads/<id>/00001"),
+        ("PUT", "/uploads/<id>/00002"),
+        ("MOVE", "/uploads/<id>/.file"),
+        ("MKCOL", ATTACHMENTS_DIR),
+        ("MOVE", "/uploads/<id>/.file"),
+    ]
+
+
+async def test_failed_chunk_removes_the_partial_upload(mock_http_client):
+    """When a part fails, the upload collection is deleted and the error
+    raised."""
+    requests: list[Request] = []
+
+    def handler(request: Request) -> Response:
+        requests.append(request)
+        if request.url.path.endswith("/00002"):
+            return Response(507)
+        return Response(201)
+
+    client = WebDAVClient(mock_http_client(handler), "user")
+    content = b"a" * (UPLOAD_CHUNK_SIZE * 2)
+
+    with pytest.raises(HTTPStatusError) as exc_info:
+        await client.add_note_attachment(1, "a.bin", content)
+
+    assert exc_info.value.response.status_code == 507
+    assert _upload_requests(requests) == [
+        ("MKCOL", "/uploads/<id>"),
+        ("PUT", "/uploads/<id>/00001"),
+        ("PUT", "/uploads/<id>/00002"),
+        ("DELETE", "/uploads/<id>"),
+    ]